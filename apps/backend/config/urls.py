@@ -23,4 +23,5 @@ urlpatterns = [
     path('api/auth/', include('users.auth_urls')),
     path('api/users/', include('users.urls')),
     path('api/events/', include('events.urls')),
+    path('api/rankings/', include('rankings.urls')),
 ]
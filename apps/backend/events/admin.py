@@ -1,16 +1,29 @@
-from celery import current_app
+import io
+
 from django.contrib import admin, messages
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import redirect
+from django.template.response import TemplateResponse
 from django.urls import path, reverse, NoReverseMatch
 from django.utils.html import format_html
 
-from .models import Event, Participation, EventCategory
+from . import cache as event_cache
+from . import exporters
+from .importers import FORMATS, EventImporter
+from .models import Event, Participation, EventCategory, WaitlistEntry
+from outbox.services import enqueue_task, enqueue_tasks
+
+from .services import EventService, LocationService, WaitlistService
 
 EVENT_RANKING_TASK = "events.generate_event_ranking"
+EVENT_RANKINGS_BATCH_TASK = "events.generate_event_rankings"
 HEAL_CHECK_TASK = "events.heal_check"
 REFRESH_RANKINGS_TASK = "rankings.refresh_rankings"
 
 EVENTS_QUEUE = "events"
+# Events scored per batch ranking task.
+RANKING_TASK_BATCH_SIZE = 5000
 RANKINGS_QUEUE = "rankings"
 
 @admin.register(Event)
@@ -22,6 +35,7 @@ class EventAdmin(admin.ModelAdmin):
         'date',
         'location',
         'slots',
+        'participants_count',
         'created_by',
         'run_ranking_task_link',
     )
@@ -33,6 +47,28 @@ class EventAdmin(admin.ModelAdmin):
         "action_refresh_rankings",
     )
 
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.geohash = LocationService.point_geohash(obj.location)
+            super().save_model(request, obj, form, change)
+            EventService.invalidate_caches(obj.geohash)
+            return
+        # Edits go through the service like the API's: only the changed
+        # columns are written, participants are notified and extra slots
+        # are filled from the waitlist.
+        data = {name: getattr(obj, name) for name in form.changed_data}
+        if not data:
+            return
+        EventService.update_event(obj, data)
+        if "slots" in data:
+            WaitlistService.promote(obj)
+
+    def delete_model(self, request, obj):
+        EventService.delete_event(obj)
+
+    def delete_queryset(self, request, queryset):
+        EventService.delete_events(queryset)
+
     @admin.display(description="Ranking task")
     def run_ranking_task_link(self, obj):
         url = reverse("admin:events_event_run_ranking", args=[obj.pk])
@@ -56,9 +92,84 @@ class EventAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(self.run_refresh_rankings_view),
                 name="events_event_run_refresh_rankings",
             ),
+            path(
+                "import/",
+                self.admin_site.admin_view(self.import_events_view),
+                name="events_event_import",
+            ),
+            path(
+                "export/",
+                self.admin_site.admin_view(self.export_events_view),
+                name="events_event_export",
+            ),
         ]
         return custom_urls + urls
 
+    def import_events_view(self, request):
+        if not self.has_add_permission(request):
+            self.message_user(request, "You cannot import events.", level=messages.ERROR)
+            return redirect(reverse("admin:events_event_changelist"))
+
+        if request.method == "POST":
+            upload = request.FILES.get("file")
+            file_format = request.POST.get("format")
+            if upload is None or file_format not in FORMATS:
+                self.message_user(request, "Select a file and a format.", level=messages.ERROR)
+                return redirect(reverse("admin:events_event_import"))
+
+            # Large uploads are spooled to disk by Django; the importer reads
+            # them incrementally.
+            stream = io.TextIOWrapper(upload.file, encoding="utf-8", newline="")
+            try:
+                result = EventImporter(request.user).run(stream, file_format)
+            except (UnicodeDecodeError, ValueError) as exc:
+                self.message_user(request, f"Import failed: {exc}", level=messages.ERROR)
+                return redirect(reverse("admin:events_event_import"))
+
+            self.message_user(
+                request,
+                f"Imported {result['created']} event(s); {result['error_count']} row(s) rejected.",
+                level=messages.SUCCESS if not result["error_count"] else messages.WARNING,
+            )
+            for error in result["errors"][:20]:
+                self.message_user(
+                    request,
+                    f"Row {error['row']}: {error['errors']}",
+                    level=messages.ERROR,
+                )
+            return redirect(reverse("admin:events_event_changelist"))
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Import events",
+            "formats": FORMATS,
+        }
+        return TemplateResponse(request, "admin/events/event/import.html", context)
+
+    def export_events_view(self, request):
+        if not request.user.is_superuser:
+            self.message_user(request, "Only superusers can export events.", level=messages.ERROR)
+            return redirect(reverse("admin:events_event_changelist"))
+
+        params = request.GET.copy()
+        dataset = params.pop("dataset", [exporters.EVENTS])[-1]
+        file_format = params.pop("format", [exporters.NDJSON])[-1]
+        try:
+            chunks = exporters.export(dataset, file_format, params)
+        except ValueError as exc:
+            self.message_user(request, str(exc), level=messages.ERROR)
+            return redirect(reverse("admin:events_event_changelist"))
+
+        content_types = {
+            exporters.NDJSON: "application/x-ndjson",
+            exporters.CSV: "text/csv",
+            exporters.GEOJSON: "application/geo+json",
+        }
+        response = StreamingHttpResponse(chunks, content_type=content_types[file_format])
+        response["Content-Disposition"] = f'attachment; filename="{dataset}.{file_format}"'
+        return response
+
     def run_ranking_task_view(self, request, event_id: int):
         if not Event.objects.filter(pk=event_id).exists():
             self.message_user(
@@ -68,14 +179,14 @@ class EventAdmin(admin.ModelAdmin):
             )
             return redirect(reverse("admin:events_event_changelist"))
 
-        result = current_app.send_task(EVENT_RANKING_TASK, args=[event_id], queue=EVENTS_QUEUE)
-        result_link = self._task_result_link(result.id)
+        task_id = enqueue_task(EVENT_RANKING_TASK, args=[event_id], queue=EVENTS_QUEUE)
+        result_link = self._task_result_link(task_id)
         self.message_user(
             request,
             format_html(
                 "Ranking task enqueued for event {} (id: {}). {}",
                 event_id,
-                result.id,
+                task_id,
                 result_link,
             ),
             level=messages.SUCCESS,
@@ -83,57 +194,67 @@ class EventAdmin(admin.ModelAdmin):
         return redirect(request.META.get("HTTP_REFERER", reverse("admin:events_event_changelist")))
 
     def run_heal_check_view(self, request):
-        result = current_app.send_task(HEAL_CHECK_TASK, queue=EVENTS_QUEUE)
-        result_link = self._task_result_link(result.id)
+        task_id = enqueue_task(HEAL_CHECK_TASK, queue=EVENTS_QUEUE)
+        result_link = self._task_result_link(task_id)
         self.message_user(
             request,
-            format_html("Heal check enqueued (id: {}). {}", result.id, result_link),
+            format_html("Heal check enqueued (id: {}). {}", task_id, result_link),
             level=messages.SUCCESS,
         )
         return redirect(request.META.get("HTTP_REFERER", reverse("admin:events_event_changelist")))
 
     def run_refresh_rankings_view(self, request):
-        result = current_app.send_task(REFRESH_RANKINGS_TASK, queue=RANKINGS_QUEUE)
-        result_link = self._task_result_link(result.id)
+        task_id = enqueue_task(REFRESH_RANKINGS_TASK, queue=RANKINGS_QUEUE)
+        result_link = self._task_result_link(task_id)
         self.message_user(
             request,
-            format_html("Refresh rankings enqueued (id: {}). {}", result.id, result_link),
+            format_html("Refresh rankings enqueued (id: {}). {}", task_id, result_link),
             level=messages.SUCCESS,
         )
         return redirect(request.META.get("HTTP_REFERER", reverse("admin:events_event_changelist")))
 
     @admin.action(description="Executar ranking para eventos selecionados")
     def action_generate_event_ranking(self, request, queryset):
-        if not queryset.exists():
+        event_ids = list(queryset.order_by("id").values_list("id", flat=True))
+        if not event_ids:
             self.message_user(request, "Nenhum evento selecionado.", level=messages.WARNING)
             return
-        task_ids = []
-        for event in queryset.only("id"):
-            result = current_app.send_task(EVENT_RANKING_TASK, args=[event.id], queue=EVENTS_QUEUE)
-            task_ids.append(result.id)
+        task_ids = enqueue_tasks(
+            EVENT_RANKINGS_BATCH_TASK,
+            [
+                [event_ids[start:start + RANKING_TASK_BATCH_SIZE]]
+                for start in range(0, len(event_ids), RANKING_TASK_BATCH_SIZE)
+            ],
+            queue=EVENTS_QUEUE,
+        )
         self.message_user(
             request,
-            f"Ranking enfileirado para {queryset.count()} evento(s).",
+            format_html(
+                "Ranking enfileirado para {} evento(s) em {} tarefa(s). {}",
+                len(event_ids),
+                len(task_ids),
+                self._task_result_link(task_ids[0]),
+            ),
             level=messages.SUCCESS,
         )
 
     @admin.action(description="Executar heal_check")
     def action_heal_check(self, request, queryset):
-        result = current_app.send_task(HEAL_CHECK_TASK, queue=EVENTS_QUEUE)
-        result_link = self._task_result_link(result.id)
+        task_id = enqueue_task(HEAL_CHECK_TASK, queue=EVENTS_QUEUE)
+        result_link = self._task_result_link(task_id)
         self.message_user(
             request,
-            format_html("Heal check enqueued (id: {}). {}", result.id, result_link),
+            format_html("Heal check enqueued (id: {}). {}", task_id, result_link),
             level=messages.SUCCESS,
         )
 
     @admin.action(description="Executar refresh_rankings")
     def action_refresh_rankings(self, request, queryset):
-        result = current_app.send_task(REFRESH_RANKINGS_TASK, queue=RANKINGS_QUEUE)
-        result_link = self._task_result_link(result.id)
+        task_id = enqueue_task(REFRESH_RANKINGS_TASK, queue=RANKINGS_QUEUE)
+        result_link = self._task_result_link(task_id)
         self.message_user(
             request,
-            format_html("Refresh rankings enqueued (id: {}). {}", result.id, result_link),
+            format_html("Refresh rankings enqueued (id: {}). {}", task_id, result_link),
             level=messages.SUCCESS,
         )
 
@@ -149,8 +270,49 @@ class ParticipationAdmin(admin.ModelAdmin):
     list_display = ('user', 'event', 'joined_at')
     list_filter = ('joined_at',)
 
+    # Joins go through the API so the slot counter and waitlist stay in
+    # sync; removals are routed through EventService below.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def delete_model(self, request, obj):
+        EventService.remove_participant(obj.event, obj.user_id)
+
+    @transaction.atomic
+    def delete_queryset(self, request, queryset):
+        for participation in queryset.select_related("event"):
+            EventService.remove_participant(participation.event, participation.user_id)
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ('user', 'event', 'created_at')
+    list_filter = ('created_at',)
+
 @admin.register(EventCategory)
 class EventCategoryAdmin(admin.ModelAdmin):
     list_display = ('name', 'slug', 'is_active')
     search_fields = ('name', 'slug')
     list_filter = ('is_active',)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        self._invalidate_caches()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        self._invalidate_caches()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        self._invalidate_caches()
+
+    def _invalidate_caches(self):
+        def invalidate():
+            event_cache.invalidate(event_cache.CATEGORIES)
+            # Category names are nested in every feed item.
+            event_cache.invalidate(event_cache.FEED)
+
+        transaction.on_commit(invalidate)
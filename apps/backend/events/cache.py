@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any, Iterable, Mapping
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.utils.http import quote_etag
+
+# Geohash precisions whose cached results are invalidated when an event in
+# the cell changes; matches the range used by MapClusterService.
+CELL_PRECISIONS = range(1, 8)
+CELL_CACHE_TIMEOUT = 60 * 10
+
+_CELL_VERSION_KEY = "events:cell:{cell}:version"
+_MAP_BUCKET_KEY = "events:map:{generation}:{cell}:{version}"
+
+RESPONSE_CACHE_TIMEOUT = 60 * 5
+# List ETags also roll over this often, bounding how long a change that
+# did not bump the version in the serving process can be answered with 304.
+LIST_ETAG_TIMEOUT = RESPONSE_CACHE_TIMEOUT
+# Upcoming-only feeds filter on the current time, so their keys change every
+# minute and an event drops out at most this long after it starts.
+UPCOMING_BUCKET_SECONDS = 60
+# Coordinates are rounded to ~110 m and radii to 100 m so nearby anonymous
+# requests share a cache entry.
+COORDINATE_DECIMALS = 3
+RADIUS_DECIMALS = 1
+
+_VERSION_KEY = "events:{name}:version"
+_RESPONSE_KEY = "events:{name}:{version}:{digest}"
+_STATS_KEY = "events:cache-stats:{name}:{outcome}"
+
+FEED = "feed"
+CATEGORIES = "categories"
+# Typeahead results; keyed on the feed version, which every event and
+# category write bumps.
+SUGGEST = "suggest"
+SUGGEST_CACHE_TIMEOUT = 60 * 10
+# Bumping the map version drops every cached cell at once (bulk writes).
+MAP = "map"
+CACHED_RESPONSES = (FEED, CATEGORIES, SUGGEST)
+
+
+def _cell_versions(cells: Iterable[str]) -> dict[str, str]:
+    keys = {cell: _CELL_VERSION_KEY.format(cell=cell) for cell in cells}
+    stored = cache.get_many(keys.values())
+    return {cell: stored.get(key, "0") for cell, key in keys.items()}
+
+
+def invalidate_cells(geohashes: Iterable[str]) -> None:
+    """
+    Bump the version of every cached cell containing the given geohashes.
+    Versions are opaque tokens, so stale entries are never read again and
+    simply expire.
+    """
+    cells = {
+        geohash[:precision]
+        for geohash in geohashes
+        if geohash
+        for precision in CELL_PRECISIONS
+    }
+    if not cells:
+        return
+    token = uuid4().hex
+    cache.set_many(
+        {_CELL_VERSION_KEY.format(cell=cell): token for cell in cells},
+        timeout=None,
+    )
+
+
+def get_map_buckets(cells: list[str]) -> dict[str, dict[str, Any]]:
+    """Cached map buckets by cell; an empty dict marks a cached empty cell."""
+    versions = _cell_versions(cells)
+    generation = version(MAP)
+    keys = {
+        cell: _MAP_BUCKET_KEY.format(generation=generation, cell=cell, version=cell_version)
+        for cell, cell_version in versions.items()
+    }
+    stored = cache.get_many(keys.values())
+    return {cell: stored[key] for cell, key in keys.items() if key in stored}
+
+
+def set_map_buckets(buckets: dict[str, dict[str, Any]]) -> None:
+    versions = _cell_versions(buckets)
+    generation = version(MAP)
+    cache.set_many(
+        {
+            _MAP_BUCKET_KEY.format(generation=generation, cell=cell, version=versions[cell]): bucket
+            for cell, bucket in buckets.items()
+        },
+        timeout=CELL_CACHE_TIMEOUT,
+    )
+
+
+def version(name: str) -> str:
+    return cache.get(_VERSION_KEY.format(name=name), "0")
+
+
+def invalidate(name: str) -> None:
+    cache.set(_VERSION_KEY.format(name=name), uuid4().hex, timeout=None)
+
+
+def normalize_params(params: Mapping[str, Any]) -> str:
+    """
+    Canonical query string for cache keys: sorted keys, blank values dropped
+    and geo params rounded.
+    """
+    normalized = []
+    for key in sorted(params):
+        value = params[key]
+        if value in (None, ""):
+            continue
+        if key in ("lat", "lng", "radius_km"):
+            decimals = RADIUS_DECIMALS if key == "radius_km" else COORDINATE_DECIMALS
+            try:
+                value = f"{round(float(value), decimals):.{decimals}f}"
+            except (TypeError, ValueError):
+                pass
+        normalized.append(f"{key}={value}")
+    return "&".join(normalized)
+
+
+def response_key(name: str, params: Mapping[str, Any], *parts: Any) -> str:
+    source = "|".join(str(part) for part in (normalize_params(params), *parts))
+    digest = hashlib.sha1(source.encode("utf-8")).hexdigest()
+    return _RESPONSE_KEY.format(name=name, version=version(name), digest=digest)
+
+
+def suggest_key(term: str, limit: int) -> str:
+    digest = hashlib.sha1(f"{limit}:{term}".encode("utf-8")).hexdigest()
+    return _RESPONSE_KEY.format(name=SUGGEST, version=version(FEED), digest=digest)
+
+
+def time_bucket(seconds: int) -> int:
+    """Index of the current `seconds`-long window, for keys that must expire."""
+    return int(time.time() // seconds)
+
+
+def etag(name: str, params: Mapping[str, Any], user, *parts: Any) -> str:
+    """
+    Strong ETag for a response of the `name` cache: it changes whenever that
+    cache is invalidated, and varies per user because of the joined flag.
+    """
+    user_part = user.pk if user.is_authenticated else "anonymous"
+    source = "|".join(
+        str(part)
+        for part in (name, version(name), normalize_params(params), user_part, *parts)
+    )
+    return quote_etag(hashlib.sha1(source.encode("utf-8")).hexdigest())
+
+
+def get_response(name: str, key: str) -> Any | None:
+    data = cache.get(key)
+    _count(name, "hits" if data is not None else "misses")
+    return data
+
+
+def set_response(key: str, data: Any, timeout: int = RESPONSE_CACHE_TIMEOUT) -> None:
+    cache.set(key, data, timeout=timeout)
+
+
+def _count(name: str, outcome: str) -> None:
+    key = _STATS_KEY.format(name=name, outcome=outcome)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr(); losing one sample is fine.
+        pass
+
+
+def stats() -> dict[str, dict[str, int]]:
+    keys = {
+        (name, outcome): _STATS_KEY.format(name=name, outcome=outcome)
+        for name in CACHED_RESPONSES
+        for outcome in ("hits", "misses")
+    }
+    stored = cache.get_many(keys.values())
+    return {
+        name: {
+            outcome: stored.get(keys[(name, outcome)], 0)
+            for outcome in ("hits", "misses")
+        }
+        for name in CACHED_RESPONSES
+    }
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any, Iterable, Iterator, Mapping
+
+from .filters import EventFilter
+from .models import Event, EventCategory, Participation
+from .services import LocationService
+
+NDJSON = "ndjson"
+CSV = "csv"
+GEOJSON = "geojson"
+FORMATS = (NDJSON, CSV, GEOJSON)
+
+EVENTS = "events"
+PARTICIPATIONS = "participations"
+CATEGORIES = "categories"
+DATASETS = (EVENTS, PARTICIPATIONS, CATEGORIES)
+
+# Rows fetched per round-trip from the server-side cursor.
+CHUNK_SIZE = 2000
+
+EVENT_FIELDS = (
+    "id", "title", "description", "date", "category_id", "city",
+    "latitude", "longitude", "geohash", "slots", "participants_count",
+    "created_by_id", "created_at", "updated_at",
+)
+PARTICIPATION_FIELDS = ("id", "event_id", "user_id", "joined_at")
+CATEGORY_FIELDS = ("id", "name", "slug", "description", "is_active", "created_at", "updated_at")
+
+
+def filtered_events(params: Mapping[str, Any]):
+    """Events matching the same query params the feed accepts through EventFilter."""
+    filterset = EventFilter(params, queryset=Event.objects.all())
+    if not filterset.is_valid():
+        raise ValueError(f"Invalid filters: {dict(filterset.errors)}")
+    return filterset.qs
+
+
+def _event_rows(events) -> Iterator[dict[str, Any]]:
+    columns = [field for field in EVENT_FIELDS if field not in ("latitude", "longitude")]
+    for values in events.order_by("id").values_list(*columns, "location").iterator(chunk_size=CHUNK_SIZE):
+        row = dict(zip(columns, values[:-1]))
+        row["latitude"], row["longitude"] = LocationService.point_to_lat_lng(values[-1])
+        yield row
+
+
+def _rows(queryset, fields) -> Iterator[dict[str, Any]]:
+    for values in queryset.order_by("id").values_list(*fields).iterator(chunk_size=CHUNK_SIZE):
+        yield dict(zip(fields, values))
+
+
+def export_rows(dataset: str, params: Mapping[str, Any]) -> tuple[tuple[str, ...], Iterator[dict[str, Any]]]:
+    if dataset == EVENTS:
+        return EVENT_FIELDS, _event_rows(filtered_events(params))
+    if dataset == PARTICIPATIONS:
+        participations = Participation.objects.filter(
+            event__in=filtered_events(params).values("pk")
+        )
+        return PARTICIPATION_FIELDS, _rows(participations, PARTICIPATION_FIELDS)
+    if dataset == CATEGORIES:
+        return CATEGORY_FIELDS, _rows(EventCategory.objects.all(), CATEGORY_FIELDS)
+    raise ValueError(f"Unknown dataset {dataset!r}; use one of {', '.join(DATASETS)}.")
+
+
+def _to_text(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, float, str)):
+        return value
+    if isinstance(value, int):
+        # Snowflake ids exceed the safe integer range of JS clients.
+        return str(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def render(fields: tuple[str, ...], rows: Iterable[dict[str, Any]], file_format: str) -> Iterator[str]:
+    """Yield the export as text chunks, one row at a time."""
+    if file_format == NDJSON:
+        for row in rows:
+            yield json.dumps({key: _to_text(value) for key, value in row.items()}) + "\n"
+        return
+
+    if file_format == CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def flush() -> str:
+            text = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            return text
+
+        writer.writerow(fields)
+        yield flush()
+        for row in rows:
+            writer.writerow([_to_text(row.get(field)) for field in fields])
+            yield flush()
+        return
+
+    if file_format == GEOJSON:
+        yield '{"type": "FeatureCollection", "features": ['
+        separator = ""
+        for row in rows:
+            properties = {
+                key: _to_text(value)
+                for key, value in row.items()
+                if key not in ("latitude", "longitude")
+            }
+            feature = {
+                "type": "Feature",
+                "geometry": {
+                    "type": "Point",
+                    "coordinates": [row["longitude"], row["latitude"]],
+                } if row["latitude"] is not None else None,
+                "properties": properties,
+            }
+            yield separator + json.dumps(feature)
+            separator = ","
+        yield "]}\n"
+
+
+def export(dataset: str, file_format: str, params: Mapping[str, Any]) -> Iterator[str]:
+    # Validate eagerly: once a streaming response starts, errors can no
+    # longer become a proper error response.
+    if file_format not in FORMATS:
+        raise ValueError(f"Unsupported format {file_format!r}; use one of {', '.join(FORMATS)}.")
+    if file_format == GEOJSON and dataset != EVENTS:
+        raise ValueError("GeoJSON export is only available for events.")
+    fields, rows = export_rows(dataset, params)
+    return render(fields, rows, file_format)
@@ -1,21 +1,72 @@
 import django_filters
-from django.db.models import Count, F
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import F, Q
+from django.utils import timezone
+from django_filters.widgets import BooleanWidget
+from rest_framework.filters import SearchFilter
 
 from .models import Event
 
+# Text search configuration created in migration 0012 (Portuguese, unaccented).
+SEARCH_CONFIG = 'portuguese_unaccent'
+
+
+def upcoming_param(params) -> bool | None:
+    """?upcoming= as EventFilter reads it; None when absent or not a boolean."""
+    return BooleanWidget().value_from_datadict(params, {}, 'upcoming')
+
 
 class EventFilter(django_filters.FilterSet):
     category = django_filters.NumberFilter(field_name='category_id')
     date_from = django_filters.DateTimeFilter(field_name='date', lookup_expr='gte')
     date_to = django_filters.DateTimeFilter(field_name='date', lookup_expr='lte')
+    city = django_filters.CharFilter(field_name='city', lookup_expr='iexact')
     open_slots = django_filters.BooleanFilter(method='filter_open_slots')
+    # EventViewSet parses the same value with upcoming_param to pick its default.
+    upcoming = django_filters.BooleanFilter(method='filter_upcoming', widget=BooleanWidget())
+    geohash = django_filters.CharFilter(field_name='geohash', lookup_expr='startswith')
 
     class Meta:
         model = Event
-        fields = ['category', 'date_from', 'date_to', 'open_slots']
+        fields = ['category', 'date_from', 'date_to', 'city', 'open_slots', 'upcoming', 'geohash']
 
     def filter_open_slots(self, queryset, name, value):
         if not value:
             return queryset
-        annotated = queryset.annotate(participants_count=Count('participations', distinct=True))
-        return annotated.filter(slots__gt=F('participants_count'))
+        return queryset.filter(participants_count__lt=F('slots'))
+
+    def filter_upcoming(self, queryset, name, value):
+        if not value:
+            return queryset
+        # A bound timestamp (not now()) lets the planner match the rolling
+        # partial index on upcoming events.
+        return queryset.filter(date__gte=timezone.now())
+
+
+class EventSearchFilter(SearchFilter):
+    """
+    ?search= over the trigger-maintained search_vector (GIN), OR'd with a
+    trigram match on the title so misspelled words still find events.
+    Without an explicit ordering (or with ordering=relevance) results come
+    back by rank.
+    """
+
+    max_search_length = 100
+    # Weight of the title's trigram similarity next to the text rank.
+    trigram_weight = 0.5
+
+    def filter_queryset(self, request, queryset, view):
+        term = ' '.join(self.get_search_terms(request))[:self.max_search_length]
+        if not term:
+            return queryset
+
+        query = SearchQuery(term, search_type='websearch', config=SEARCH_CONFIG)
+        queryset = queryset.filter(
+            Q(search_vector=query) | Q(title__trigram_word_similar=term)
+        ).annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+            + self.trigram_weight * TrigramWordSimilarity(term, 'title'),
+        )
+        if request.query_params.get('ordering') in (None, '', 'relevance'):
+            queryset = queryset.order_by('-search_rank', 'date')
+        return queryset
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import csv
+import json
+from typing import Any, Iterator, TextIO
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+
+from common.snowflake import SNOWFLAKE_GENERATOR
+from rankings.models import ParticipationChange
+
+from . import cache as event_cache
+from .models import Event, EventCategory
+from .services import LocationService
+
+CSV = "csv"
+GEOJSON = "geojson"
+FORMATS = (CSV, GEOJSON)
+
+DEFAULT_CHUNK_SIZE = 1000
+# Only the first errors are kept in memory; the total is always counted.
+MAX_REPORTED_ERRORS = 1000
+
+_READ_SIZE = 64 * 1024
+
+
+def iter_csv_rows(stream: TextIO) -> Iterator[tuple[int, dict[str, Any]]]:
+    # Row numbers match the file, with the header on line 1.
+    for line_number, row in enumerate(csv.DictReader(stream), start=2):
+        yield line_number, row
+
+
+def iter_geojson_rows(stream: TextIO) -> Iterator[tuple[int, Any]]:
+    """
+    Stream the features of a GeoJSON FeatureCollection one at a time, so the
+    whole document never has to be loaded. Features are numbered from 1 and
+    yielded as decoded; feature_to_row turns each into an import row.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = stream.read(_READ_SIZE)
+        if not chunk:
+            eof = True
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    def skip_whitespace():
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            if position < len(buffer) or eof:
+                return
+            fill()
+
+    # Seek to the opening bracket of the "features" array.
+    while True:
+        index = buffer.find('"features"')
+        if index != -1:
+            bracket = buffer.find("[", index)
+            if bracket != -1:
+                position = bracket + 1
+                break
+            position = index
+        else:
+            position = max(0, len(buffer) - len('"features"'))
+        if eof:
+            raise ValueError("GeoJSON input has no \"features\" array.")
+        fill()
+
+    feature_number = 0
+    while True:
+        skip_whitespace()
+        if position >= len(buffer):
+            raise ValueError("GeoJSON input ended inside the \"features\" array.")
+        if buffer[position] == "]":
+            return
+        if buffer[position] == ",":
+            position += 1
+            continue
+
+        while True:
+            try:
+                feature, end = decoder.raw_decode(buffer, position)
+                break
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError(f"Invalid GeoJSON feature #{feature_number + 1}.")
+                fill()
+        position = end
+        feature_number += 1
+        yield feature_number, feature
+
+
+def feature_to_row(feature: Any) -> dict[str, Any]:
+    if not isinstance(feature, dict):
+        raise serializers.ValidationError({"detail": "Each feature must be a GeoJSON object."})
+    properties = feature.get("properties") or {}
+    if not isinstance(properties, dict):
+        raise serializers.ValidationError({"properties": "Feature properties must be an object."})
+    row = dict(properties)
+    geometry = feature.get("geometry")
+    if not isinstance(geometry, dict):
+        geometry = {}
+    coordinates = geometry.get("coordinates") if geometry.get("type") == "Point" else None
+    if isinstance(coordinates, list) and len(coordinates) >= 2:
+        row["longitude"], row["latitude"] = coordinates[0], coordinates[1]
+    return row
+
+
+class EventImporter:
+    """
+    Validates imported rows in chunks and writes each chunk with a single
+    bulk_create. Snowflake ids and geohashes are computed up front because
+    bulk_create skips EventService.create_event.
+    """
+
+    REQUIRED_FIELDS = ("title", "date", "category", "latitude", "longitude", "slots")
+
+    def __init__(self, user, *, chunk_size: int = DEFAULT_CHUNK_SIZE, dry_run: bool = False):
+        self.user = user
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.created = 0
+        self.error_count = 0
+        self.errors: list[dict[str, Any]] = []
+        self._categories: dict[str, int] = {}
+        for category_id, slug in EventCategory.objects.filter(is_active=True).values_list("id", "slug"):
+            self._categories[slug] = category_id
+            self._categories[str(category_id)] = category_id
+
+    def run(self, stream: TextIO, file_format: str) -> dict[str, Any]:
+        if file_format == CSV:
+            rows = iter_csv_rows(stream)
+        elif file_format == GEOJSON:
+            rows = iter_geojson_rows(stream)
+        else:
+            raise ValueError(f"Unsupported format {file_format!r}; use one of {', '.join(FORMATS)}.")
+
+        batch: list[Event] = []
+        for row_number, row in rows:
+            try:
+                if file_format == GEOJSON:
+                    row = feature_to_row(row)
+                batch.append(self.build_event(row))
+            except serializers.ValidationError as exc:
+                self._add_error(row_number, exc.detail)
+                continue
+            if len(batch) >= self.chunk_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+        if self.created:
+            transaction.on_commit(self._invalidate_caches)
+        return {
+            "created": self.created,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+    def build_event(self, row: dict[str, Any]) -> Event:
+        """Build an unsaved event, applying EventSerializer's rules to the row."""
+        missing = {
+            field: "This field is required."
+            for field in self.REQUIRED_FIELDS
+            if row.get(field) is None or str(row[field]).strip() == ""
+        }
+        if missing:
+            raise serializers.ValidationError(missing)
+
+        title = str(row["title"]).strip()
+        if len(title) > 255:
+            raise serializers.ValidationError({"title": "Ensure this field has no more than 255 characters."})
+
+        try:
+            # Well-formed but impossible values (month 13) raise ValueError.
+            date = parse_datetime(str(row["date"]).strip())
+        except ValueError:
+            date = None
+        if date is None:
+            raise serializers.ValidationError({"date": "Use an ISO 8601 datetime."})
+        if timezone.is_naive(date):
+            date = timezone.make_aware(date)
+        if date < timezone.now():
+            raise serializers.ValidationError({"date": "Event date cannot be in the past."})
+
+        category_id = self._categories.get(str(row["category"]).strip())
+        if category_id is None:
+            raise serializers.ValidationError({"category": "Unknown or inactive category."})
+
+        try:
+            slots = int(row["slots"])
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({"slots": "A valid integer is required."})
+        if slots < 1:
+            raise serializers.ValidationError({"slots": "Ensure this value is greater than or equal to 1."})
+
+        try:
+            lat = float(row["latitude"])
+            lng = float(row["longitude"])
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({"detail": "Latitude and longitude must be valid numbers."})
+        location = LocationService.build_point(lat, lng)
+
+        return Event(
+            id=SNOWFLAKE_GENERATOR.generate(),
+            title=title,
+            description=str(row.get("description") or ""),
+            date=date,
+            category_id=category_id,
+            city=LocationService.normalize_city(row.get("city")),
+            location=location,
+            geohash=LocationService.geohash(lat, lng),
+            created_by=self.user,
+            slots=slots,
+        )
+
+    def _write(self, batch: list[Event]) -> None:
+        if not self.dry_run:
+            with transaction.atomic():
+                Event.objects.bulk_create(batch)
+                # Log the new events like EventService.create_event, so the
+                # next incremental refresh scores them.
+                ParticipationChange.objects.bulk_create(
+                    [
+                        ParticipationChange(
+                            event_id=event.pk,
+                            user_id=self.user.pk,
+                            delta=ParticipationChange.TOUCHED,
+                        )
+                        for event in batch
+                    ]
+                )
+        self.created += len(batch)
+
+    def _add_error(self, row_number: int, detail: Any) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "errors": detail})
+
+    @staticmethod
+    def _invalidate_caches() -> None:
+        # An import can touch any number of cells; drop them all at once.
+        event_cache.invalidate(event_cache.FEED)
+        event_cache.invalidate(event_cache.MAP)
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from rankings.models import EventScore
+
+from . import cache as event_cache
+from .models import Event, EventHistory, Participation, ParticipationHistory, WaitlistEntry
+
+UPCOMING_INDEX_PREFIX = "events_upcoming_"
+# Events moved to history per transaction.
+ARCHIVE_BATCH_SIZE = 500
+# Monthly history partitions kept ready past the archive cutoff's month.
+HISTORY_PARTITIONS_AHEAD = 2
+
+# Partitioned history table -> its partition key column.
+HISTORY_TABLES = {
+    "events-history": "date",
+    "events-participation-history": "event_date",
+}
+
+
+def month_start(moment: datetime) -> datetime:
+    return moment.astimezone(dt_timezone.utc).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    month_index = moment.month - 1 + months
+    return moment.replace(year=moment.year + month_index // 12, month=month_index % 12 + 1)
+
+
+def upcoming_index_name(cutoff: datetime) -> str:
+    return f"{UPCOMING_INDEX_PREFIX}{cutoff:%Y_%m}_idx"
+
+
+def _index_valid(cursor, name: str) -> bool | None:
+    """pg_index.indisvalid of the named index, or None when it does not exist."""
+    cursor.execute(
+        """
+        SELECT i.indisvalid
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = %s
+        """,
+        [name],
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def build_upcoming_index(cursor, now: datetime | None = None) -> str:
+    """
+    Build the partial index over events dated from the start of the
+    current month and return its name. Index predicates cannot use now(),
+    so the cutoff is a constant. Needs autocommit: CONCURRENTLY cannot run
+    in a transaction.
+
+    A failed CONCURRENTLY build leaves an INVALID index behind, which is
+    dropped and rebuilt; RuntimeError is raised if the index is still not
+    valid.
+    """
+    cutoff = month_start(now or timezone.now())
+    name = upcoming_index_name(cutoff)
+    quoted_name = connection.ops.quote_name(name)
+    table = connection.ops.quote_name(Event._meta.db_table)
+    if _index_valid(cursor, name) is False:
+        cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {quoted_name}")
+    # DDL takes no bind parameters; the cutoff is a generated literal.
+    cursor.execute(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {quoted_name} "
+        f"ON {table} (date, id) WHERE date >= '{cutoff.isoformat()}'"
+    )
+    if not _index_valid(cursor, name):
+        raise RuntimeError(f"Index {name} is not valid; keeping the previous upcoming index.")
+    return name
+
+
+def rotate_upcoming_index(now: datetime | None = None) -> dict[str, list[str] | str]:
+    """
+    Move the upcoming index's cutoff forward monthly: the new index is
+    built before the old one is dropped, and any `date >= <now>` filter is
+    implied by the predicate. Migration 0016 creates the first index; this
+    runs from the beat schedule.
+    """
+    with connection.cursor() as cursor:
+        name = build_upcoming_index(cursor, now)
+        cursor.execute(
+            "SELECT indexname FROM pg_indexes WHERE tablename = %s AND indexname LIKE %s",
+            [Event._meta.db_table, f"{UPCOMING_INDEX_PREFIX}%"],
+        )
+        stale = [row[0] for row in cursor.fetchall() if row[0] != name]
+        for index in stale:
+            cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {connection.ops.quote_name(index)}")
+    return {"index": name, "dropped": stale}
+
+
+def _move_participations_sql() -> str:
+    return f"""
+        WITH moved AS (
+            DELETE FROM {connection.ops.quote_name(Participation._meta.db_table)} p
+            USING {connection.ops.quote_name(Event._meta.db_table)} e
+            WHERE p.event_id = e.id AND e.id = ANY(%s)
+            RETURNING p.id, p.event_id, p.user_id, p.joined_at, e.date
+        )
+        INSERT INTO {connection.ops.quote_name(ParticipationHistory._meta.db_table)}
+            (id, event_id, user_id, joined_at, event_date, archived_at)
+        SELECT id, event_id, user_id, joined_at, date, now() FROM moved
+    """
+
+
+def _move_events_sql() -> str:
+    columns = (
+        "id, title, description, date, category_id, city, location, geohash, "
+        "created_by_id, slots, participants_count, created_at, updated_at"
+    )
+    return f"""
+        WITH moved AS (
+            DELETE FROM {connection.ops.quote_name(Event._meta.db_table)}
+            WHERE id = ANY(%s)
+            RETURNING {columns}
+        )
+        INSERT INTO {connection.ops.quote_name(EventHistory._meta.db_table)}
+            ({columns}, archived_at)
+        SELECT {columns}, now() FROM moved
+    """
+
+
+def archive_past_events(before: datetime | None = None, batch_size: int = ARCHIVE_BATCH_SIZE) -> dict[str, int]:
+    """
+    Move events dated before `before` and their participations into the
+    partitioned history tables, one batch per transaction. Waitlists and
+    scores of archived events are dropped; user counters and leaderboards
+    keep counting the archived games.
+    """
+    if before is None:
+        before = timezone.now() - timedelta(days=settings.EVENTS_ARCHIVE_AFTER_DAYS)
+
+    events = participations = 0
+    while True:
+        with transaction.atomic():
+            event_ids = list(
+                Event.objects.filter(date__lt=before)
+                .order_by("date")
+                .select_for_update(skip_locked=True)
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not event_ids:
+                break
+
+            WaitlistEntry.objects.filter(event_id__in=event_ids).delete()
+            EventScore.objects.filter(event_id__in=event_ids).delete()
+            with connection.cursor() as cursor:
+                cursor.execute(_move_participations_sql(), [event_ids])
+                participations += cursor.rowcount
+                cursor.execute(_move_events_sql(), [event_ids])
+                events += cursor.rowcount
+
+    if events:
+        event_cache.invalidate(event_cache.FEED)
+        event_cache.invalidate(event_cache.MAP)
+    return {"events": events, "participations": participations}
+
+
+def _partition_name(parent: str, start: datetime) -> str:
+    return f"{parent}-{start:%Y-%m}"
+
+
+def _partitions(cursor, parent: str) -> list[str]:
+    cursor.execute(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = %s
+        """,
+        [parent],
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _attach_month(cursor, parent: str, column: str, start: datetime) -> int:
+    """
+    Create the partition for one month and attach it. Rows of that month
+    already sitting in the DEFAULT partition are moved first, otherwise the
+    attach would fail its range check. Returns the number of rows moved.
+    """
+    end = add_months(start, 1)
+    quote = connection.ops.quote_name
+    name = _partition_name(parent, start)
+    default = f"{parent}-default"
+    with transaction.atomic():
+        cursor.execute(
+            f"CREATE TABLE {quote(name)} (LIKE {quote(parent)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM {quote(default)}
+                WHERE {quote(column)} >= %s AND {quote(column)} < %s
+                RETURNING *
+            )
+            INSERT INTO {quote(name)} SELECT * FROM moved
+            """,
+            [start, end],
+        )
+        moved = cursor.rowcount
+        # DDL takes no bind parameters; the bounds are generated literals.
+        cursor.execute(
+            f"ALTER TABLE {quote(parent)} ATTACH PARTITION {quote(name)} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    return moved
+
+
+def manage_history_partitions(now: datetime | None = None) -> dict[str, dict[str, list[str] | int]]:
+    """
+    Keep monthly partitions on the history tables: create them ahead of the
+    archive cutoff, adopt months that already landed in DEFAULT, and detach
+    months older than EVENTS_HISTORY_RETENTION_MONTHS (0 keeps everything).
+    Detached partitions stay as standalone tables to dump or drop.
+
+    Only the history tables are partitioned: the hot tables' snowflake
+    primary keys are referenced by foreign keys, and a partitioned table's
+    unique keys must include the partition column.
+    """
+    now = now or timezone.now()
+    cutoff_month = month_start(now - timedelta(days=settings.EVENTS_ARCHIVE_AFTER_DAYS))
+    wanted = [add_months(cutoff_month, offset) for offset in range(-1, HISTORY_PARTITIONS_AHEAD + 1)]
+    retention = settings.EVENTS_HISTORY_RETENTION_MONTHS
+    oldest_kept = add_months(month_start(now), -retention) if retention else None
+
+    result = {}
+    with connection.cursor() as cursor:
+        for parent, column in HISTORY_TABLES.items():
+            quote = connection.ops.quote_name
+            cursor.execute(
+                f"SELECT DISTINCT date_trunc('month', {quote(column)} AT TIME ZONE 'UTC') "
+                f"FROM {quote(parent + '-default')}"
+            )
+            in_default = [row[0].replace(tzinfo=dt_timezone.utc) for row in cursor.fetchall()]
+
+            existing = set(_partitions(cursor, parent))
+            created, moved = [], 0
+            for start in sorted(set(wanted) | set(in_default)):
+                if oldest_kept and start < oldest_kept:
+                    continue
+                name = _partition_name(parent, start)
+                if name in existing:
+                    continue
+                moved += _attach_month(cursor, parent, column, start)
+                created.append(name)
+
+            detached = []
+            if oldest_kept:
+                for name in sorted(existing):
+                    month = name.removeprefix(f"{parent}-")
+                    if month == "default" or month >= f"{oldest_kept:%Y-%m}":
+                        continue
+                    cursor.execute(f"ALTER TABLE {quote(parent)} DETACH PARTITION {quote(name)}")
+                    detached.append(name)
+
+            result[parent] = {"created": created, "moved": moved, "detached": detached}
+    return result
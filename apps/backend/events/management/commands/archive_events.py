@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from events.maintenance import ARCHIVE_BATCH_SIZE, archive_past_events
+
+
+class Command(BaseCommand):
+    help = "Move past events and their participations into the history tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=settings.EVENTS_ARCHIVE_AFTER_DAYS,
+            help="Archive events dated more than this many days ago.",
+        )
+        parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options["older_than_days"])
+        result = archive_past_events(before, options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {result['events']} event(s) and {result['participations']} participation(s)."
+            )
+        )
@@ -0,0 +1,123 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from events.maintenance import UPCOMING_INDEX_PREFIX
+from events.models import Event, EventCategory
+from events.pagination import EventLimitOffsetPagination
+from events.views import EventViewSet
+
+FEED_LIMIT = EventLimitOffsetPagination.default_limit
+DATE_INDEX = "events_date_idx"
+# Index each feed shape is meant to be served by (migrations 0009 to 0014).
+SHAPE_INDEXES = {
+    "soonest": DATE_INDEX,
+    "newest": "events_created_at_idx",
+    "popular": "events_popular_idx",
+    "date_range": DATE_INDEX,
+    "open_slots": "events_open_slots_date_idx",
+    "upcoming": DATE_INDEX,
+    "search": "events_search_vector_idx",
+    "category": "events_category_date_idx",
+    "city": "events_city_date_idx",
+    "near": "events_location_gist_idx",
+    "distance": "events_location_gist_idx",
+}
+
+
+def feed_shapes(category_id=None, city=None, lat=None, lng=None) -> dict[str, dict[str, str]]:
+    """Query params of the main feed shapes; the optional ones need a value."""
+    now = timezone.now()
+    shapes = {
+        "soonest": {},
+        "newest": {"ordering": "newest"},
+        "popular": {"ordering": "popular"},
+        "date_range": {
+            "date_from": now.isoformat(),
+            "date_to": (now + timedelta(days=30)).isoformat(),
+        },
+        "open_slots": {"open_slots": "true"},
+        "upcoming": {"upcoming": "true"},
+        "search": {"search": "futebol"},
+    }
+    if category_id is not None:
+        shapes["category"] = {"category": str(category_id)}
+    if city:
+        shapes["city"] = {"city": city}
+    if lat is not None and lng is not None:
+        shapes["near"] = {"lat": str(lat), "lng": str(lng), "radius_km": "10"}
+        shapes["distance"] = {"lat": str(lat), "lng": str(lng), "ordering": "distance"}
+    return shapes
+
+
+def feed_queryset(params, user=None, limit=FEED_LIMIT):
+    """
+    The first page of the list queryset EventViewSet builds for `params`,
+    with its joins, annotations, filters and ordering.
+    """
+    request = APIRequestFactory().get("/api/events/", params)
+    if user is not None:
+        force_authenticate(request, user=user)
+    view = EventViewSet(action="list", format_kwarg=None, args=(), kwargs={})
+    view.request = Request(request)
+    return view.filter_queryset(view.get_queryset())[:limit]
+
+
+def uses_shape_index(shape: str, plan: str) -> bool:
+    """
+    Whether the plan reads the index meant for `shape`. Date-ordered shapes
+    may use the rolling upcoming index instead, the same (date, id) columns
+    restricted to recent events.
+    """
+    expected = SHAPE_INDEXES[shape]
+    if expected == DATE_INDEX and re.search(rf"\b{UPCOMING_INDEX_PREFIX}", plan):
+        return True
+    return re.search(rf"\b{re.escape(expected)}\b", plan) is not None
+
+
+class Command(BaseCommand):
+    help = (
+        "Print EXPLAIN plans for the main feed query shapes, built through "
+        "EventViewSet. Run it against a representative dataset: on small "
+        "tables a sequential scan is the planner's right call."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Execute the queries (EXPLAIN ANALYZE) to report actual timings.",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if any shape does not use the index meant for it.",
+        )
+
+    def shapes(self):
+        sample = Event.objects.exclude(city="").values("city", "location").first() or {}
+        point = sample.get("location")
+        return feed_shapes(
+            category_id=EventCategory.objects.values_list("id", flat=True).first(),
+            city=sample.get("city"),
+            lat=point.y if point else None,
+            lng=point.x if point else None,
+        )
+
+    def handle(self, *args, **options):
+        offenders = []
+        for name, params in self.shapes().items():
+            plan = feed_queryset(params).explain(analyze=options["analyze"])
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(plan + "\n")
+            if not uses_shape_index(name, plan):
+                offenders.append(f"{name} ({SHAPE_INDEXES[name]})")
+
+        if options["check"] and offenders:
+            raise CommandError(f"Expected index not used for: {', '.join(offenders)}.")
+        if options["check"]:
+            self.stdout.write(self.style.SUCCESS("All feed shapes use their indexes."))
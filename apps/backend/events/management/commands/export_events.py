@@ -0,0 +1,43 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from events.exporters import DATASETS, EVENTS, FORMATS, NDJSON, export
+
+
+class Command(BaseCommand):
+    help = "Stream events, participations or categories as NDJSON, CSV or GeoJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dataset", choices=DATASETS, default=EVENTS)
+        parser.add_argument("--format", choices=FORMATS, default=NDJSON)
+        parser.add_argument(
+            "--output",
+            help="File to write to; defaults to stdout.",
+        )
+        parser.add_argument(
+            "--filter",
+            action="append",
+            default=[],
+            metavar="NAME=VALUE",
+            help="Feed filter (category, date_from, date_to, open_slots, geohash); repeatable.",
+        )
+
+    def handle(self, *args, **options):
+        params = {}
+        for item in options["filter"]:
+            name, separator, value = item.partition("=")
+            if not separator:
+                raise CommandError(f"Filters must look like NAME=VALUE, got {item!r}.")
+            params[name] = value
+
+        try:
+            chunks = export(options["dataset"], options["format"], params)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as output:
+                output.writelines(chunks)
+        else:
+            sys.stdout.writelines(chunks)
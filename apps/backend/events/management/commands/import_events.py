@@ -0,0 +1,72 @@
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from events.importers import CSV, DEFAULT_CHUNK_SIZE, FORMATS, GEOJSON, EventImporter
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Stream events from a CSV file or a GeoJSON FeatureCollection and bulk insert them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or GeoJSON file to import.")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Input format; inferred from the file extension when omitted.",
+        )
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="Username recorded as the creator of the imported events.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate every row without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        file_format = options["format"] or self._infer_format(path)
+
+        try:
+            user = User.objects.get(username=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} not found.")
+
+        importer = EventImporter(
+            user,
+            chunk_size=options["chunk_size"],
+            dry_run=options["dry_run"],
+        )
+        try:
+            with path.open(encoding="utf-8", newline="") as stream:
+                result = importer.run(stream, file_format)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        for error in result["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if result["error_count"] > len(result["errors"]):
+            self.stderr.write(f"... {result['error_count'] - len(result['errors'])} more row error(s).")
+
+        verb = "Validated" if options["dry_run"] else "Imported"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {result['created']} event(s); {result['error_count']} row(s) rejected."
+            )
+        )
+
+    @staticmethod
+    def _infer_format(path: Path) -> str:
+        suffix = path.suffix.lower()
+        if suffix == ".csv":
+            return CSV
+        if suffix in (".geojson", ".json"):
+            return GEOJSON
+        raise CommandError("Cannot infer the format from the file extension; pass --format.")
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from events.maintenance import manage_history_partitions
+
+
+class Command(BaseCommand):
+    help = "Create, adopt and detach monthly partitions of the event history tables."
+
+    def handle(self, *args, **options):
+        for table, result in manage_history_partitions().items():
+            self.stdout.write(
+                f"{table}: created {len(result['created'])}, "
+                f"moved {result['moved']} row(s) out of default, "
+                f"detached {len(result['detached'])}"
+            )
+            for name in result["detached"]:
+                self.stdout.write(f"  detached {name}")
+        self.stdout.write(self.style.SUCCESS("History partitions are up to date."))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from events.models import Event, Participation
+
+
+class Command(BaseCommand):
+    help = "Recompute Event.participants_count for events that drifted from their participations."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drifted events without updating them.",
+        )
+
+    def handle(self, *args, **options):
+        actual_count = Coalesce(
+            Subquery(
+                Participation.objects.filter(event=OuterRef("pk"))
+                .order_by()
+                .values("event")
+                .annotate(total=Count("id"))
+                .values("total")
+            ),
+            0,
+        )
+        drifted = Event.objects.annotate(actual_count=actual_count).exclude(
+            participants_count=F("actual_count")
+        )
+
+        if options["dry_run"]:
+            for event_id, stored, actual in drifted.values_list(
+                "id", "participants_count", "actual_count"
+            ).iterator():
+                self.stdout.write(f"Event {event_id}: stored={stored} actual={actual}")
+            return
+
+        updated = Event.objects.filter(pk__in=drifted.values("pk")).update(
+            participants_count=actual_count
+        )
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {updated} event(s)."))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.10 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+BACKFILL_PARTICIPANTS_COUNT = """
+UPDATE "events"
+SET "participants_count" = counts.total
+FROM (
+    SELECT "event_id", COUNT(*) AS total
+    FROM "events-participation"
+    GROUP BY "event_id"
+) AS counts
+WHERE "events"."id" = counts."event_id";
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0008_alter_event_id_alter_participation_id_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="participants_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_PARTICIPANTS_COUNT, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["-participants_count", "date"],
+                name="events_popular_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("participants_count__lt", models.F("slots"))),
+                fields=["date"],
+                name="events_open_slots_date_idx",
+            ),
+        ),
+    ]
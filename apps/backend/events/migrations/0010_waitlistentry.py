@@ -0,0 +1,55 @@
+# Generated by Django 5.2.10 on 2026-10-18 12:30
+
+import django.db.models.deletion
+import snowflake_id.django_field
+import snowflake_id.generator
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0009_event_participants_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WaitlistEntry",
+            fields=[
+                (
+                    "id",
+                    snowflake_id.django_field.DjangoSnowflakeIDField(
+                        default=snowflake_id.generator.SnowflakeGenerator.generate,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="waitlist_entries",
+                        to="events.event",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="waitlist_entries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "events-waitlist",
+                "indexes": [
+                    models.Index(fields=["event", "created_at"], name="events_waitlist_queue_idx"),
+                ],
+                "unique_together": {("user", "event")},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.10 on 2026-10-18 13:00
+
+from django.db import migrations, models
+
+
+BACKFILL_GEOHASH = """
+UPDATE "events"
+SET "geohash" = ST_GeoHash("location"::geometry, 12)
+WHERE "location" IS NOT NULL;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0010_waitlistentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="geohash",
+            field=models.CharField(blank=True, default="", editable=False, max_length=12),
+        ),
+        migrations.RunSQL(BACKFILL_GEOHASH, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["geohash"],
+                name="events_geohash_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:10
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension, UnaccentExtension
+from django.db import migrations
+
+
+# Portuguese stemming on unaccented words, so "futebol society" matches
+# "Futebol Society" and "volei" matches "vôlei".
+CREATE_SEARCH_CONFIG = """
+CREATE TEXT SEARCH CONFIGURATION portuguese_unaccent (COPY = portuguese);
+ALTER TEXT SEARCH CONFIGURATION portuguese_unaccent
+    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+"""
+
+DROP_SEARCH_CONFIG = "DROP TEXT SEARCH CONFIGURATION IF EXISTS portuguese_unaccent;"
+
+# Weights: title (A) > category name (B) > description (C).
+CREATE_TRIGGERS = """
+CREATE FUNCTION events_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('portuguese_unaccent', coalesce(NEW.title, '')), 'A')
+        || setweight(to_tsvector('portuguese_unaccent', coalesce(
+            (SELECT name FROM "events-categories" WHERE id = NEW.category_id), ''
+        )), 'B')
+        || setweight(to_tsvector('portuguese_unaccent', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER events_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description, category_id ON "events"
+    FOR EACH ROW EXECUTE FUNCTION events_search_vector_update();
+
+-- Renaming a category re-indexes its events through the trigger above.
+CREATE FUNCTION events_category_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    IF NEW.name IS DISTINCT FROM OLD.name THEN
+        UPDATE "events" SET title = title WHERE category_id = NEW.id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER events_category_search_vector_trigger
+    AFTER UPDATE OF name ON "events-categories"
+    FOR EACH ROW EXECUTE FUNCTION events_category_search_vector_update();
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER IF EXISTS events_category_search_vector_trigger ON "events-categories";
+DROP FUNCTION IF EXISTS events_category_search_vector_update();
+DROP TRIGGER IF EXISTS events_search_vector_trigger ON "events";
+DROP FUNCTION IF EXISTS events_search_vector_update();
+"""
+
+BACKFILL_SEARCH_VECTOR = 'UPDATE "events" SET title = title;'
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0011_event_geohash"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        UnaccentExtension(),
+        migrations.RunSQL(CREATE_SEARCH_CONFIG, DROP_SEARCH_CONFIG),
+        migrations.AddField(
+            model_name="event",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+        migrations.RunSQL(BACKFILL_SEARCH_VECTOR, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="event",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"],
+                name="events_search_vector_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["title"],
+                name="events_title_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
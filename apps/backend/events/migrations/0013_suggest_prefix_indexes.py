@@ -0,0 +1,44 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:40
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0012_event_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("title"),
+                    name="text_pattern_ops",
+                ),
+                name="events_title_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("city"),
+                    name="text_pattern_ops",
+                ),
+                name="events_city_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventcategory",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="text_pattern_ops",
+                ),
+                name="events_category_prefix_idx",
+            ),
+        ),
+    ]
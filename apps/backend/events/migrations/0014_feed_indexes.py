@@ -0,0 +1,33 @@
+# Generated by Django 5.2.10 on 2026-10-18 19:05
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0013_suggest_prefix_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["date", "id"], name="events_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["created_at", "id"], name="events_created_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["category", "date"], name="events_category_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                django.db.models.functions.text.Upper("city"),
+                models.F("date"),
+                name="events_city_date_idx",
+            ),
+        ),
+    ]
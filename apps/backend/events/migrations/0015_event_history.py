@@ -0,0 +1,103 @@
+# Generated by Django 5.2.10 on 2026-10-18 19:40
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+
+
+# Partitioned by month of the event date; rows outside the created
+# partitions land in the DEFAULT partition until one is attached.
+CREATE_HISTORY_TABLES = """
+CREATE TABLE "events-history" (
+    "id" bigint NOT NULL,
+    "title" varchar(255) NOT NULL,
+    "description" text NOT NULL,
+    "date" timestamp with time zone NOT NULL,
+    "category_id" bigint NOT NULL,
+    "city" varchar(120) NOT NULL,
+    "location" geography(Point, 4326) NOT NULL,
+    "geohash" varchar(12) NOT NULL,
+    "created_by_id" bigint NOT NULL,
+    "slots" integer NOT NULL,
+    "participants_count" integer NOT NULL,
+    "created_at" timestamp with time zone NOT NULL,
+    "updated_at" timestamp with time zone NOT NULL,
+    "archived_at" timestamp with time zone NOT NULL DEFAULT now(),
+    PRIMARY KEY ("id", "date")
+) PARTITION BY RANGE ("date");
+
+CREATE TABLE "events-history-default" PARTITION OF "events-history" DEFAULT;
+CREATE INDEX "events_history_created_by_idx" ON "events-history" ("created_by_id");
+
+CREATE TABLE "events-participation-history" (
+    "id" bigint NOT NULL,
+    "event_id" bigint NOT NULL,
+    "user_id" bigint NOT NULL,
+    "joined_at" timestamp with time zone NOT NULL,
+    "event_date" timestamp with time zone NOT NULL,
+    "archived_at" timestamp with time zone NOT NULL DEFAULT now(),
+    PRIMARY KEY ("id", "event_date")
+) PARTITION BY RANGE ("event_date");
+
+CREATE TABLE "events-participation-history-default"
+    PARTITION OF "events-participation-history" DEFAULT;
+CREATE INDEX "events_participation_history_user_idx"
+    ON "events-participation-history" ("user_id");
+CREATE INDEX "events_participation_history_event_idx"
+    ON "events-participation-history" ("event_id");
+"""
+
+DROP_HISTORY_TABLES = """
+DROP TABLE IF EXISTS "events-participation-history";
+DROP TABLE IF EXISTS "events-history";
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0014_feed_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_HISTORY_TABLES, DROP_HISTORY_TABLES),
+        migrations.CreateModel(
+            name="EventHistory",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=255)),
+                ("description", models.TextField()),
+                ("date", models.DateTimeField()),
+                ("category_id", models.BigIntegerField()),
+                ("city", models.CharField(max_length=120)),
+                (
+                    "location",
+                    django.contrib.gis.db.models.fields.PointField(geography=True, srid=4326),
+                ),
+                ("geohash", models.CharField(max_length=12)),
+                ("created_by_id", models.BigIntegerField()),
+                ("slots", models.IntegerField()),
+                ("participants_count", models.IntegerField()),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "events-history",
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="ParticipationHistory",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("event_id", models.BigIntegerField()),
+                ("user_id", models.BigIntegerField()),
+                ("joined_at", models.DateTimeField()),
+                ("event_date", models.DateTimeField()),
+                ("archived_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "events-participation-history",
+                "managed": False,
+            },
+        ),
+    ]
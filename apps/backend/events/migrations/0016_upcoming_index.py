@@ -0,0 +1,37 @@
+# Generated by Django 5.2.10 on 2026-10-18 21:10
+
+from django.db import migrations
+
+from events.maintenance import UPCOMING_INDEX_PREFIX, build_upcoming_index
+
+
+def create_upcoming_index(apps, schema_editor):
+    # The beat task only moves the cutoff forward; without this the
+    # upcoming-only feed runs unindexed until its first run.
+    with schema_editor.connection.cursor() as cursor:
+        build_upcoming_index(cursor)
+
+
+def drop_upcoming_indexes(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexname FROM pg_indexes WHERE tablename = %s AND indexname LIKE %s",
+            ["events", f"{UPCOMING_INDEX_PREFIX}%"],
+        )
+        for (name,) in cursor.fetchall():
+            cursor.execute(
+                f"DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(name)}"
+            )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("events", "0015_event_history"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_upcoming_index, reverse_code=drop_upcoming_indexes),
+    ]
@@ -1,17 +1,68 @@
 from django.db import models
+from django.db.models import Exists, F, OuterRef, Q, Value
+from django.db.models.functions import Upper
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.contrib.gis.db import models as gis_models
-from django.contrib.postgres.indexes import GistIndex
+from django.contrib.postgres.indexes import GinIndex, GistIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from snowflake_id.django_field import DjangoSnowflakeIDField
 from common.snowflake import SNOWFLAKE_GENERATOR
 
 
+class EventQuerySet(models.QuerySet):
+    def with_user_joined(self, user):
+        # Resolve "joined by requester" as a single EXISTS subquery per row
+        # instead of one query per serialized event.
+        if user is None or not user.is_authenticated:
+            return self.annotate(is_authenticated_user_joined=Value(False))
+        return self.annotate(
+            is_authenticated_user_joined=Exists(
+                Participation.objects.filter(event=OuterRef("pk"), user=user)
+            )
+        )
+
+
 class Event(models.Model):
     class Meta:
         db_table = "events"
         indexes = [
             GistIndex(fields=["location"], name="events_location_gist_idx"),
+            models.Index(
+                fields=["-participants_count", "date"],
+                name="events_popular_idx",
+            ),
+            models.Index(
+                fields=["date"],
+                condition=Q(participants_count__lt=F("slots")),
+                name="events_open_slots_date_idx",
+            ),
+            models.Index(
+                fields=["geohash"],
+                opclasses=["varchar_pattern_ops"],
+                name="events_geohash_prefix_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="events_search_vector_idx"),
+            GinIndex(
+                fields=["title"],
+                opclasses=["gin_trgm_ops"],
+                name="events_title_trgm_idx",
+            ),
+            # Case-insensitive prefix lookups (istartswith) for suggestions.
+            models.Index(
+                OpClass(Upper("title"), name="text_pattern_ops"),
+                name="events_title_prefix_idx",
+            ),
+            models.Index(
+                OpClass(Upper("city"), name="text_pattern_ops"),
+                name="events_city_prefix_idx",
+            ),
+            # Feed shapes: the id tiebreaker matches keyset pagination, and
+            # each filtered shape gets its equality column first.
+            models.Index(fields=["date", "id"], name="events_date_idx"),
+            models.Index(fields=["created_at", "id"], name="events_created_at_idx"),
+            models.Index(fields=["category", "date"], name="events_category_date_idx"),
+            models.Index(Upper("city"), F("date"), name="events_city_date_idx"),
         ]
 
     id = DjangoSnowflakeIDField(generator=SNOWFLAKE_GENERATOR)
@@ -30,16 +81,25 @@ class Event(models.Model):
         geography=True,
         srid=4326,
     )
+    # Geohash of `location`, so cell and viewport lookups are prefix scans.
+    geohash = models.CharField(max_length=12, blank=True, default="", editable=False)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="created_events",
     )
     slots = models.IntegerField(validators=[MinValueValidator(1)])
+    # Denormalized count of participations, kept in sync by EventService.
+    participants_count = models.IntegerField(default=0, editable=False)
+    # Weighted title/category/description document, maintained by a
+    # database trigger (see migration 0012) so bulk writes stay indexed.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EventQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.title} ({self.date.strftime('%Y-%m-%d %H:%M')})"
 
@@ -68,11 +128,40 @@ class Participation(models.Model):
         return f"{self.user} -> {self.event.title}"
 
 
+class WaitlistEntry(models.Model):
+    class Meta:
+        db_table = "events-waitlist"
+        unique_together = ("user", "event")
+        indexes = [
+            models.Index(fields=["event", "created_at"], name="events_waitlist_queue_idx"),
+        ]
+
+    id = DjangoSnowflakeIDField(generator=SNOWFLAKE_GENERATOR)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="waitlist_entries",
+    )
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="waitlist_entries"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.user} waiting for {self.event.title}"
+
+
 class EventCategory(models.Model):
     class Meta:
         db_table = "events-categories"
         verbose_name_plural = "Event categories"
         ordering = ["name"]
+        indexes = [
+            models.Index(
+                OpClass(Upper("name"), name="text_pattern_ops"),
+                name="events_category_prefix_idx",
+            ),
+        ]
 
     name = models.CharField(max_length=80)
     slug = models.SlugField(max_length=80, unique=True)
@@ -83,3 +172,52 @@ class EventCategory(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class EventHistory(models.Model):
+    """
+    Archived past events, moved out of the hot table by
+    events.maintenance.archive_past_events. The table is range-partitioned
+    by date and created in SQL (migration 0015), hence unmanaged; its real
+    primary key is (id, date), which partitioning requires.
+    """
+
+    class Meta:
+        managed = False
+        db_table = "events-history"
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    date = models.DateTimeField()
+    category_id = models.BigIntegerField()
+    city = models.CharField(max_length=120)
+    location = gis_models.PointField(geography=True, srid=4326)
+    geohash = models.CharField(max_length=12)
+    created_by_id = models.BigIntegerField()
+    slots = models.IntegerField()
+    participants_count = models.IntegerField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.title} ({self.date.strftime('%Y-%m-%d %H:%M')})"
+
+
+class ParticipationHistory(models.Model):
+    """Participations of archived events, partitioned by the event's date."""
+
+    class Meta:
+        managed = False
+        db_table = "events-participation-history"
+
+    id = models.BigIntegerField(primary_key=True)
+    event_id = models.BigIntegerField()
+    user_id = models.BigIntegerField()
+    joined_at = models.DateTimeField()
+    event_date = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.event_id}"
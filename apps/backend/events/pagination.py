@@ -1,6 +1,133 @@
-from rest_framework.pagination import LimitOffsetPagination
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class EventLimitOffsetPagination(LimitOffsetPagination):
     default_limit = 10
     max_limit = 50
+
+
+class EventKeysetPagination(BasePagination):
+    """
+    Seek pagination over (sort key, id) for the event feed.
+    The snowflake id is the tiebreaker, so positions stay stable while events
+    are created or joined, and no COUNT(*) is issued. Distance ordering seeks
+    on the KNN (<->) distance so each page stays an index walk. Search
+    results are ranked by relevance, which has no stable seek key, so
+    ?search= is rejected here and served with offset pagination.
+    """
+
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    default_limit = EventLimitOffsetPagination.default_limit
+    max_limit = EventLimitOffsetPagination.max_limit
+    invalid_cursor_message = 'Invalid cursor.'
+
+    # ordering query param -> (sort field, descending)
+    orderings = {
+        None: ('date', False),
+        'soonest': ('date', False),
+        'date': ('date', False),
+        '-date': ('date', True),
+        'newest': ('created_at', True),
+        'created_at': ('created_at', False),
+        '-created_at': ('created_at', True),
+        'distance': ('knn_distance', False),
+    }
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if request.query_params.get('search', '').strip():
+            raise ValidationError(
+                {"detail": "Cursor pagination cannot be combined with search; use offset pagination."}
+            )
+        self.limit = self.get_limit(request)
+        self.field, self.descending = self.get_ordering(request)
+
+        direction = '-' if self.descending else ''
+        queryset = queryset.order_by(f'{direction}{self.field}', f'{direction}id')
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            value, pk = cursor
+            lookup = 'lt' if self.descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': value})
+                | Q(**{self.field: value, f'id__{lookup}': pk})
+            )
+
+        results = list(queryset[:self.limit + 1])
+        self.has_next = len(results) > self.limit
+        results = results[:self.limit]
+        self.last = results[-1] if results else None
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, TypeError, ValueError):
+            return self.default_limit
+        if limit <= 0:
+            return self.default_limit
+        return min(limit, self.max_limit)
+
+    def get_ordering(self, request):
+        ordering = request.query_params.get('ordering') or None
+        if ordering not in self.orderings:
+            raise ValidationError(
+                {"detail": "Cursor pagination supports soonest, newest or distance ordering."}
+            )
+        return self.orderings[ordering]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.last))
+
+    def encode_cursor(self, instance):
+        value = getattr(instance, self.field)
+        if self.field != 'knn_distance':
+            value = value.isoformat()
+        payload = json.dumps([value, str(instance.pk)]).encode('ascii')
+        return base64.urlsafe_b64encode(payload).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            pk = int(pk)
+            if self.field == 'knn_distance':
+                value = float(value)
+            else:
+                value = parse_datetime(value)
+                if value is None:
+                    raise ValueError
+        except (TypeError, ValueError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from .models import Event, Participation, EventCategory
 from users.serializers import UserSafeSerializer
-from .services import EventService, LocationService
+from .services import EventService, LocationService, WaitlistService
 
 class ParticipationSerializer(serializers.ModelSerializer):
     id = serializers.CharField(read_only=True)
@@ -18,11 +18,55 @@ class EventCategorySerializer(serializers.ModelSerializer):
         model = EventCategory
         fields = ('id', 'name', 'slug', 'description')
 
-class EventSerializer(serializers.ModelSerializer):
+class EventAnnotationsMixin:
+    # Read the per-request joined flag precomputed by EventViewSet.get_queryset,
+    # falling back to a query for instances loaded elsewhere.
+    def get_is_authenticated_user_joined(self, obj):
+        request = self.context.get('request')
+        if not (request and request.user.is_authenticated):
+            return False
+        annotated_joined = getattr(obj, 'is_authenticated_user_joined', None)
+        if annotated_joined is not None:
+            return annotated_joined
+        return Participation.objects.filter(user=request.user, event=obj).exists()
+
+class EventListSerializer(EventAnnotationsMixin, serializers.ModelSerializer):
+    """Compact representation for the feed; the roster is only sent on retrieve."""
     id = serializers.CharField(read_only=True)
     created_by = UserSafeSerializer(read_only=True)
+    category = EventCategorySerializer(read_only=True)
     is_authenticated_user_joined = serializers.SerializerMethodField()
-    participants_count = serializers.SerializerMethodField()
+    participants_count = serializers.IntegerField(read_only=True)
+    distance = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Event
+        fields = (
+            'id', 'title', 'date', 'category', 'city',
+            'created_by', 'slots', 'participants_count',
+            'is_authenticated_user_joined', 'distance',
+        )
+        read_only_fields = fields
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        lat, lng = LocationService.point_to_lat_lng(getattr(instance, 'location', None))
+        data['latitude'] = lat
+        data['longitude'] = lng
+        return data
+
+    def get_distance(self, obj):
+        # Kilometers, matching the radius_km query param; only set when lat/lng are sent.
+        distance = getattr(obj, 'distance', None)
+        if distance is None:
+            return None
+        return round(distance.km, 3)
+
+class EventSerializer(EventAnnotationsMixin, serializers.ModelSerializer):
+    id = serializers.CharField(read_only=True)
+    created_by = UserSafeSerializer(read_only=True)
+    is_authenticated_user_joined = serializers.SerializerMethodField()
+    participants_count = serializers.IntegerField(read_only=True)
     participations = ParticipationSerializer(many=True, read_only=True)
     latitude = serializers.FloatField(required=False)
     longitude = serializers.FloatField(required=False)
@@ -71,9 +115,10 @@ class EventSerializer(serializers.ModelSerializer):
         return EventService.create_event(created_by, validated_data)
 
     def update(self, instance, validated_data):
-        if 'city' in validated_data:
-            validated_data['city'] = LocationService.normalize_city(validated_data.get('city'))
-        return super().update(instance, validated_data)
+        instance = EventService.update_event(instance, validated_data)
+        if 'slots' in validated_data:
+            WaitlistService.promote(instance)
+        return instance
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -86,17 +131,10 @@ class EventSerializer(serializers.ModelSerializer):
         data['longitude'] = lng
         return data
 
-    def get_is_authenticated_user_joined(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return Participation.objects.filter(user=request.user, event=obj).exists()
-        return False
-
-    def get_participants_count(self, obj):
-        annotated_count = getattr(obj, 'participants_count', None)
-        if annotated_count is not None:
-            return annotated_count
-        return obj.participations.count()
+    def validate_slots(self, value):
+        if self.instance is not None and value < self.instance.participants_count:
+            raise serializers.ValidationError("Slots cannot be lower than the current number of participants.")
+        return value
 
     def validate_date(self, value):
         from django.utils import timezone
@@ -1,12 +1,45 @@
 from __future__ import annotations
 
-from typing import Any, Mapping, MutableMapping, Tuple
+import math
+from functools import reduce
+from operator import or_
+from typing import Any, Callable, Mapping, MutableMapping, Tuple
 
-from django.contrib.gis.geos import Point
-from django.db import transaction
+from django.contrib.auth import get_user_model
+from django.contrib.gis.db.models import Collect, PointField
+from django.contrib.gis.db.models.functions import Centroid
+from django.contrib.gis.geos import Point, Polygon
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Min, Q, Value
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models.functions import Cast, Substr
 from rest_framework import serializers
 
-from .models import Event, Participation
+from common.snowflake import SNOWFLAKE_GENERATOR
+from notifications.services import schedule_event_notification
+from outbox.services import enqueue_tasks
+from rankings.models import EventScore, ParticipationChange
+from rankings.services import (
+    SCORE_BATCH_SIZE,
+    record_changes,
+    retract_leaderboards,
+    score_events,
+)
+
+from . import cache as event_cache
+from .models import Event, EventCategory, Participation, WaitlistEntry
+
+User = get_user_model()
+
+WAITLIST_PROMOTION_TASK = "notifications.dispatch_waitlist_promotions"
+NOTIFICATIONS_QUEUE = "notifications"
+# Promoted users notified per task; one promotion pass enqueues
+# ceil(promoted / batch) tasks instead of one per user.
+NOTIFICATION_BATCH_SIZE = 500
+
+
+class EventFullError(ValueError):
+    pass
 
 
 class LocationService:
@@ -16,6 +49,8 @@ class LocationService:
     """
 
     SRID = 4326
+    GEOHASH_PRECISION = 12
+    GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
 
     @staticmethod
     def normalize_city(city: Any) -> str:
@@ -46,6 +81,12 @@ class LocationService:
         # PostGIS expects (x, y) == (longitude, latitude)
         return Point(lng, lat, srid=cls.SRID)
 
+    @classmethod
+    def geography_value(cls, point: Point) -> Value:
+        # Bind the point as geography so operators against the geography
+        # column (e.g. KNN <->) are not resolved through a geometry cast.
+        return Value(point, output_field=PointField(srid=cls.SRID, geography=True))
+
     @classmethod
     def coerce_point(
         cls,
@@ -96,43 +137,522 @@ class LocationService:
 
         return cls.build_point(lat_value, lng_value), True
 
+    @classmethod
+    def geohash(cls, lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+        # Same encoding as PostGIS ST_GeoHash, so stored values and
+        # database-side prefixes line up.
+        lat_range = [-90.0, 90.0]
+        lng_range = [-180.0, 180.0]
+        chars = []
+        bits = 0
+        value = 0
+        even = True
+        while len(chars) < precision:
+            coord, bounds = (lng, lng_range) if even else (lat, lat_range)
+            mid = (bounds[0] + bounds[1]) / 2
+            value <<= 1
+            if coord >= mid:
+                value |= 1
+                bounds[0] = mid
+            else:
+                bounds[1] = mid
+            even = not even
+            bits += 1
+            if bits == 5:
+                chars.append(cls.GEOHASH_ALPHABET[value])
+                bits = 0
+                value = 0
+        return "".join(chars)
+
+    @classmethod
+    def point_geohash(cls, point: Point | None) -> str:
+        if not point:
+            return ""
+        return cls.geohash(point.y, point.x)
+
+    @classmethod
+    def covering_cells(
+        cls,
+        bbox: tuple[float, float, float, float],
+        precision: int,
+        limit: int | None = None,
+    ) -> list[str] | None:
+        """
+        Geohash cells of the given precision that overlap the bbox, or None
+        when more than `limit` cells would be needed.
+        """
+        min_lng, min_lat, max_lng, max_lat = bbox
+        lng_bits = math.ceil(precision * 5 / 2)
+        lat_bits = math.floor(precision * 5 / 2)
+        cell_width = 360.0 / (1 << lng_bits)
+        cell_height = 180.0 / (1 << lat_bits)
+        lng_cells = range(
+            int((min_lng + 180) // cell_width),
+            min(int((max_lng + 180) // cell_width), (1 << lng_bits) - 1) + 1,
+        )
+        lat_cells = range(
+            int((min_lat + 90) // cell_height),
+            min(int((max_lat + 90) // cell_height), (1 << lat_bits) - 1) + 1,
+        )
+        if limit is not None and len(lng_cells) * len(lat_cells) > limit:
+            return None
+        return [
+            cls.geohash(
+                -90 + (y + 0.5) * cell_height,
+                -180 + (x + 0.5) * cell_width,
+                precision,
+            )
+            for y in lat_cells
+            for x in lng_cells
+        ]
+
     @staticmethod
     def point_to_lat_lng(point: Point | None) -> tuple[float | None, float | None]:
         if not point:
             return None, None
         return point.y, point.x
 
+class MapClusterService:
+    """
+    Buckets events in a map viewport by geohash cell so a zoomed-out map is
+    drawn from one grouped query instead of paging through the feed.
+    """
+
+    MAX_ZOOM = 22
+    # Viewports spanning more cells than this skip the per-cell cache.
+    MAX_CACHED_CELLS = 256
+    # Upper zoom bound -> geohash precision; cells shrink as the map zooms in.
+    ZOOM_PRECISION = (
+        (2, 1),
+        (5, 2),
+        (7, 3),
+        (10, 4),
+        (12, 5),
+        (15, 6),
+        (MAX_ZOOM, 7),
+    )
+
+    @staticmethod
+    def parse_bbox(raw: Any) -> Polygon:
+        try:
+            min_lng, min_lat, max_lng, max_lat = (float(value) for value in str(raw).split(","))
+        except (TypeError, ValueError):
+            raise serializers.ValidationError(
+                {"bbox": "Use bbox=min_lng,min_lat,max_lng,max_lat."}
+            )
+        LocationService.build_point(min_lat, min_lng)
+        LocationService.build_point(max_lat, max_lng)
+        if min_lng >= max_lng or min_lat >= max_lat:
+            raise serializers.ValidationError(
+                {"bbox": "Minimum coordinates must be lower than maximum coordinates."}
+            )
+        return Polygon.from_bbox((min_lng, min_lat, max_lng, max_lat))
+
+    @classmethod
+    def parse_zoom(cls, raw: Any) -> int:
+        try:
+            zoom = int(raw)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({"zoom": "zoom must be an integer."})
+        if not (0 <= zoom <= cls.MAX_ZOOM):
+            raise serializers.ValidationError(
+                {"zoom": f"zoom must be between 0 and {cls.MAX_ZOOM}."}
+            )
+        return zoom
+
+    @classmethod
+    def precision_for_zoom(cls, zoom: int) -> int:
+        for max_zoom, precision in cls.ZOOM_PRECISION:
+            if zoom <= max_zoom:
+                return precision
+        return cls.ZOOM_PRECISION[-1][1]
+
+    @classmethod
+    def cluster(
+        cls, queryset, bbox: Polygon, zoom: int, use_cache: bool = False
+    ) -> dict[str, Any]:
+        precision = cls.precision_for_zoom(zoom)
+        bbox.srid = LocationService.SRID
+
+        cells = None
+        if use_cache:
+            cells = LocationService.covering_cells(
+                bbox.extent, precision, limit=cls.MAX_CACHED_CELLS
+            )
+        if cells is None:
+            buckets = cls._buckets(queryset.filter(location__intersects=bbox), precision)
+            return {"zoom": zoom, "precision": precision, "clusters": buckets}
+
+        # Cached buckets cover whole cells, so cells on the viewport edge may
+        # include events slightly outside it.
+        cached = event_cache.get_map_buckets(cells)
+        missing = [cell for cell in cells if cell not in cached]
+        if missing:
+            prefix_filter = reduce(or_, (Q(geohash__startswith=cell) for cell in missing))
+            fresh = {
+                bucket["geohash"]: bucket
+                for bucket in cls._buckets(queryset.filter(prefix_filter), precision)
+            }
+            fresh = {cell: fresh.get(cell, {}) for cell in missing}
+            event_cache.set_map_buckets(fresh)
+            cached.update(fresh)
+
+        buckets = [cached[cell] for cell in cells if cached[cell]]
+        return {"zoom": zoom, "precision": precision, "clusters": buckets}
+
+    @staticmethod
+    def _buckets(queryset, precision: int) -> list[dict[str, Any]]:
+        geometry = Cast("location", PointField(srid=LocationService.SRID))
+        rows = list(
+            queryset.annotate(cell=Substr("geohash", 1, precision))
+            .order_by()
+            .values("cell")
+            .annotate(
+                count=Count("id"),
+                event_id=Min("id"),
+                center=Centroid(Collect(geometry)),
+            )
+        )
+        titles = dict(
+            Event.objects.filter(
+                pk__in=[row["event_id"] for row in rows]
+            ).values_list("id", "title")
+        )
+
+        buckets = []
+        for row in rows:
+            lat, lng = LocationService.point_to_lat_lng(row["center"])
+            buckets.append(
+                {
+                    "geohash": row["cell"],
+                    "count": row["count"],
+                    "latitude": lat,
+                    "longitude": lng,
+                    "event": {
+                        "id": str(row["event_id"]),
+                        "title": titles.get(row["event_id"], ""),
+                    },
+                }
+            )
+        return buckets
+
+
+class SuggestService:
+    """
+    Typeahead over event titles, cities and category names. Each lookup is a
+    prefix range on an UPPER(...) text_pattern_ops index; titles also match
+    by trigram word similarity once the term is long enough to form
+    trigrams.
+    """
+
+    DEFAULT_LIMIT = 5
+    MAX_LIMIT = 10
+    MAX_TERM_LENGTH = 60
+    TRIGRAM_MIN_LENGTH = 3
+
+    @classmethod
+    def normalize(cls, term: Any) -> str:
+        return " ".join(str(term or "").split())[:cls.MAX_TERM_LENGTH].lower()
+
+    @classmethod
+    def parse_limit(cls, raw: Any) -> int:
+        try:
+            limit = int(raw)
+        except (TypeError, ValueError):
+            return cls.DEFAULT_LIMIT
+        return max(1, min(limit, cls.MAX_LIMIT))
+
+    @classmethod
+    def suggest(cls, term: str, limit: int) -> dict[str, Any]:
+        if not term:
+            return {"query": term, "events": [], "cities": [], "categories": []}
+
+        title_match = Q(title__istartswith=term)
+        if len(term) >= cls.TRIGRAM_MIN_LENGTH:
+            title_match |= Q(title__trigram_word_similar=term)
+            events = (
+                Event.objects.filter(title_match)
+                .annotate(similarity=TrigramWordSimilarity(term, "title"))
+                .order_by("-similarity", "date")
+            )
+        else:
+            events = Event.objects.filter(title_match).order_by("title")
+
+        cities = (
+            Event.objects.filter(city__istartswith=term)
+            .order_by()
+            .values("city")
+            .annotate(events=Count("id"))
+            .order_by("-events", "city")
+        )
+        categories = EventCategory.objects.filter(
+            is_active=True, name__istartswith=term
+        ).order_by("name")
+
+        return {
+            "query": term,
+            "events": [
+                {"id": str(pk), "label": title}
+                for pk, title in events.values_list("id", "title")[:limit]
+            ],
+            "cities": [{"label": row["city"]} for row in cities[:limit]],
+            "categories": [
+                {"id": pk, "slug": slug, "label": name}
+                for pk, slug, name in categories.values_list("id", "slug", "name")[:limit]
+            ],
+        }
+
+
 class EventService:
     @staticmethod
     @transaction.atomic
     def create_event(user, data):
         data["city"] = LocationService.normalize_city(data.get("city"))
-        return Event.objects.create(created_by=user, **data)
+        data["geohash"] = LocationService.point_geohash(data.get("location"))
+        event = Event.objects.create(created_by=user, **data)
+        record_changes(event.pk, [user.pk], ParticipationChange.TOUCHED)
+        EventService.invalidate_caches(event.geohash)
+        return event
+
+    @staticmethod
+    @transaction.atomic
+    def update_event(event, data):
+        previous_geohash = event.geohash
+        if "city" in data:
+            data["city"] = LocationService.normalize_city(data.get("city"))
+        if "location" in data:
+            data["geohash"] = LocationService.point_geohash(data.get("location"))
+        for attr, value in data.items():
+            setattr(event, attr, value)
+        # Only the edited columns: a full save would write back the
+        # participants_count read with the instance, undoing concurrent joins.
+        event.save(update_fields={*data, "updated_at"})
+        EventService.invalidate_caches(previous_geohash, event.geohash)
+        # Claims the pending row and writes the outbox task in this
+        # transaction, so the notice commits or rolls back with the edit.
+        schedule_event_notification(event.pk)
+        return event
+
+    @staticmethod
+    @transaction.atomic
+    def delete_event(event):
+        EventService.delete_events(Event.objects.filter(pk=event.pk))
+
+    @staticmethod
+    @transaction.atomic
+    def delete_events(queryset) -> int:
+        """
+        Delete events together with the per-user side of their
+        participations, which the cascade alone leaves behind: each
+        participant's games_played_count is decremented, LEFT changes are
+        logged for the scores, and the leaderboards drop the games.
+        """
+        # FOR UPDATE also blocks joins, whose participation insert takes a
+        # KEY SHARE lock on the event, so the participant set is final.
+        events = list(queryset.order_by("id").select_for_update().values_list("id", "geohash"))
+        if not events:
+            return 0
+        event_ids = [event_id for event_id, _ in events]
+
+        retract_leaderboards(event_ids)
+        participants: dict[int, list[int]] = {}
+        for event_id, user_id in Participation.objects.filter(event_id__in=event_ids).values_list(
+            "event_id", "user_id"
+        ):
+            participants.setdefault(event_id, []).append(user_id)
+        for event_id, user_ids in participants.items():
+            User.objects.filter(pk__in=user_ids).update(games_played_count=F("games_played_count") - 1)
+            record_changes(event_id, user_ids, ParticipationChange.LEFT)
+
+        Event.objects.filter(pk__in=event_ids).delete()
+        EventService.invalidate_caches(*{geohash for _, geohash in events})
+        return len(events)
+
+    @staticmethod
+    def invalidate_caches(*geohashes):
+        def invalidate():
+            event_cache.invalidate(event_cache.FEED)
+            event_cache.invalidate_cells(geohashes)
+
+        transaction.on_commit(invalidate)
 
     @staticmethod
     @transaction.atomic
     def join_event(user, event):
-        if Participation.objects.filter(user=user, event=event).exists():
-            raise ValueError("You have already joined this event.")
+        # Take the user's waitlist entry first. A promotion holding it makes
+        # this wait for that promotion to commit (and then fail as a
+        # duplicate below); deleting it keeps a promotion from inserting a
+        # participation for this user while the join waits on the event row.
+        WaitlistEntry.objects.filter(user=user, event=event).delete()
 
-        if event.participations.count() >= event.slots:
-            raise ValueError("Event is full.")
+        # The unique (user, event) constraint rejects duplicates without a
+        # pre-check; the savepoint keeps the outer transaction usable.
+        try:
+            with transaction.atomic():
+                participation = Participation.objects.create(user=user, event=event)
+        except IntegrityError:
+            raise ValueError("You have already joined this event.")
 
-        return Participation.objects.create(user=user, event=event)
+        # Reserve the slot with a single conditional UPDATE. Concurrent joins
+        # serialize on the event row only from here until commit, and a full
+        # event matches no row, rolling back the participation above.
+        reserved = Event.objects.filter(
+            pk=event.pk, participants_count__lt=F("slots")
+        ).update(participants_count=F("participants_count") + 1)
+        if not reserved:
+            raise EventFullError("Event is full.")
+        User.objects.filter(pk=user.pk).update(games_played_count=F("games_played_count") + 1)
+        record_changes(event.pk, [user.pk], ParticipationChange.JOINED)
+        EventService.invalidate_caches()
+        return participation
 
     @staticmethod
     @transaction.atomic
     def leave_event(user, event):
-        participation = Participation.objects.filter(user=user, event=event).first()
-        if not participation:
-            raise ValueError("You are not a participant of this event.")
+        if EventService.remove_participant(event, user.id):
+            return True
+        if WaitlistService.dequeue(user, event):
+            return True
+        raise ValueError("You are not a participant of this event.")
 
-        participation.delete()
+    @staticmethod
+    @transaction.atomic
+    def remove_participant(event, user_id) -> bool:
+        deleted, _ = Participation.objects.filter(event=event, user_id=user_id).delete()
+        if not deleted:
+            return False
+        Event.objects.filter(pk=event.pk).update(
+            participants_count=F("participants_count") - 1
+        )
+        User.objects.filter(pk=user_id).update(games_played_count=F("games_played_count") - 1)
+        record_changes(event.pk, [user_id], ParticipationChange.LEFT)
+        WaitlistService.promote(event)
+        EventService.invalidate_caches()
         return True
 
 
-def generate_event_ranking(event_id: int) -> dict[str, int | bool]:
-    event = Event.objects.filter(id=event_id).only("id").first()
-    if not event:
+class WaitlistService:
+    @staticmethod
+    @transaction.atomic
+    def enqueue(user, event):
+        if Participation.objects.filter(user=user, event=event).exists():
+            raise ValueError("You have already joined this event.")
+        try:
+            with transaction.atomic():
+                entry = WaitlistEntry.objects.create(user=user, event=event)
+        except IntegrityError:
+            raise ValueError("You are already on the waitlist for this event.")
+
+        # A slot may have been freed between the failed join and the enqueue.
+        WaitlistService.promote(event)
+        return entry
+
+    @staticmethod
+    @transaction.atomic
+    def dequeue(user, event) -> bool:
+        deleted, _ = WaitlistEntry.objects.filter(user=user, event=event).delete()
+        return bool(deleted)
+
+    @staticmethod
+    def position(entry) -> int | None:
+        if not WaitlistEntry.objects.filter(pk=entry.pk).exists():
+            return None
+        return WaitlistEntry.objects.filter(
+            event_id=entry.event_id, created_at__lte=entry.created_at
+        ).count()
+
+    @staticmethod
+    @transaction.atomic
+    def promote(event) -> list[int]:
+        """
+        Move the oldest waiters into free slots and return their user ids.
+        The event row lock makes promotion win over concurrent joins, which
+        block on the same row in join_event's conditional update. It is a
+        NO KEY UPDATE lock: FOR UPDATE would also conflict with the KEY SHARE
+        lock a concurrent join holds through its participation's foreign key,
+        and deadlock against it.
+        """
+        event = (
+            Event.objects.select_for_update(no_key=True)
+            .only("id", "slots", "participants_count")
+            .get(pk=event.pk)
+        )
+        free_slots = event.slots - event.participants_count
+        if free_slots <= 0:
+            return []
+
+        entries = list(
+            WaitlistEntry.objects.select_for_update(skip_locked=True)
+            .filter(event=event)
+            .order_by("created_at", "id")[:free_slots]
+        )
+        if not entries:
+            return []
+
+        # Waiters who joined directly in the meantime already have their
+        # participation; skip them and count only the rows inserted here.
+        # ignore_conflicts returns no ids, so they are generated up front.
+        participations = Participation.objects.bulk_create(
+            [
+                Participation(id=SNOWFLAKE_GENERATOR.generate(), user_id=entry.user_id, event=event)
+                for entry in entries
+            ],
+            ignore_conflicts=True,
+        )
+        WaitlistEntry.objects.filter(pk__in=[entry.pk for entry in entries]).delete()
+        user_ids = list(
+            Participation.objects.filter(
+                pk__in=[participation.pk for participation in participations]
+            ).values_list("user_id", flat=True)
+        )
+        if not user_ids:
+            return []
+        Event.objects.filter(pk=event.pk).update(
+            participants_count=F("participants_count") + len(user_ids)
+        )
+        User.objects.filter(pk__in=user_ids).update(games_played_count=F("games_played_count") + 1)
+        record_changes(event.pk, user_ids, ParticipationChange.JOINED)
+        EventService.invalidate_caches()
+        WaitlistService.notify_promoted(event.pk, user_ids)
+        return user_ids
+
+    @staticmethod
+    def notify_promoted(event_id: int, user_ids: list[int]) -> None:
+        # Written to the task outbox in the promoting transaction, so the
+        # notices exist exactly when the promotion commits.
+        enqueue_tasks(
+            WAITLIST_PROMOTION_TASK,
+            [
+                [event_id, user_ids[start:start + NOTIFICATION_BATCH_SIZE]]
+                for start in range(0, len(user_ids), NOTIFICATION_BATCH_SIZE)
+            ],
+            queue=NOTIFICATIONS_QUEUE,
+        )
+
+
+def generate_event_ranking(event_id: int) -> dict[str, Any]:
+    if not score_events([event_id]):
         raise ValueError("Event not found.")
-    return {"event_id": event_id, "generated": True}
+    score = EventScore.objects.get(event_id=event_id)
+    return {
+        "event_id": event_id,
+        "generated": True,
+        "score": score.score,
+        "velocity": score.velocity,
+        "fill_ratio": score.fill_ratio,
+        "recency": score.recency,
+        "popularity": score.popularity,
+    }
+
+
+def generate_event_rankings(
+    event_ids: list[int], on_progress: Callable[[int, int], None] | None = None
+) -> dict[str, int]:
+    """Score many events set-wise, reporting progress after each batch."""
+    total = len(event_ids)
+    scored = 0
+    for start in range(0, total, SCORE_BATCH_SIZE):
+        scored += score_events(event_ids[start:start + SCORE_BATCH_SIZE])
+        if on_progress:
+            on_progress(min(start + SCORE_BATCH_SIZE, total), total)
+    return {"requested": total, "scored": scored}
@@ -1,6 +1,7 @@
 from celery import shared_task
 
-from .services import generate_event_ranking
+from .maintenance import archive_past_events, manage_history_partitions, rotate_upcoming_index
+from .services import generate_event_ranking, generate_event_rankings
 
 
 @shared_task(
@@ -14,6 +15,20 @@ def generate_event_ranking_task(self, event_id: int):
     return generate_event_ranking(event_id)
 
 
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 3, "countdown": 10},
+    name="events.generate_event_rankings",
+)
+def generate_event_rankings_task(self, event_ids: list[int]):
+    def report(done: int, total: int):
+        # Stored by django_celery_results, so the admin shows live progress.
+        self.update_state(state="PROGRESS", meta={"done": done, "total": total})
+
+    return generate_event_rankings(event_ids, on_progress=report)
+
+
 @shared_task(
     bind=True,
     autoretry_for=(Exception,),
@@ -24,3 +39,33 @@ def heal_check(self):
     print("Executing heal check task")
     print("Heal check executed - will retry")
     raise Exception("Forçando retry")
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 3, "countdown": 60},
+    name="events.rotate_upcoming_index",
+)
+def rotate_upcoming_index_task(self):
+    return rotate_upcoming_index()
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 3, "countdown": 60},
+    name="events.archive_past_events",
+)
+def archive_past_events_task(self):
+    return archive_past_events()
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 3, "countdown": 60},
+    name="events.manage_history_partitions",
+)
+def manage_history_partitions_task(self):
+    return manage_history_partitions()
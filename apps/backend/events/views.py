@@ -3,15 +3,28 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 from rest_framework.exceptions import ValidationError
-from django.contrib.gis.db.models.functions import Distance
+from django_filters.rest_framework import DjangoFilterBackend
+from django.contrib.gis.db.models.functions import Distance, GeometryDistance
 from django.contrib.gis.measure import D
-from django.db.models import Count
+from django.conf import settings
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from .models import Event, Participation, EventCategory
-from .serializers import EventSerializer, EventCategorySerializer
+from .serializers import EventSerializer, EventListSerializer, EventCategorySerializer
 
-from .services import EventService, LocationService
-from .filters import EventFilter
-from .pagination import EventLimitOffsetPagination
+from . import cache as event_cache
+from .services import (
+    EventFullError,
+    EventService,
+    LocationService,
+    MapClusterService,
+    SuggestService,
+    WaitlistService,
+)
+from .filters import EventFilter, EventSearchFilter, upcoming_param
+from .pagination import EventKeysetPagination, EventLimitOffsetPagination
 
 
 class IsEventCreatorOrReadOnly(BasePermission):
@@ -22,19 +35,59 @@ class IsEventCreatorOrReadOnly(BasePermission):
             return request.user.is_superuser or obj.created_by_id == request.user.id
         return False
 
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    # If-None-Match uses weak comparison.
+    etags = [value.removeprefix('W/') for value in parse_etags(header)]
+    return '*' in etags or etag in etags
+
+
+def not_modified(etag):
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+
 class EventViewSet(viewsets.ModelViewSet):
     queryset = Event.objects.all().order_by('date')
     serializer_class = EventSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsEventCreatorOrReadOnly]
     pagination_class = EventLimitOffsetPagination
+    # Ordering is resolved in get_queryset; OrderingFilter would reset the
+    # custom values (popular, newest, distance) back to the default.
+    filter_backends = [DjangoFilterBackend, EventSearchFilter]
     filterset_class = EventFilter
-    search_fields = ['title', 'description', 'category__name']
-    ordering_fields = ['date', 'created_at']
-    ordering = ['date']
+
+    @property
+    def paginator(self):
+        # Keyset pagination is opt-in with ?pagination=cursor.
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get('pagination') == 'cursor':
+                self._paginator = EventKeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return EventListSerializer
+        return super().get_serializer_class()
 
     def get_queryset(self):
         queryset = Event.objects.all().select_related('category', 'created_by')
-        queryset = queryset.annotate(participants_count=Count('participations', distinct=True))
+        queryset = queryset.with_user_joined(self.request.user)
+
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(
+                Prefetch('participations', queryset=Participation.objects.select_related('user'))
+            )
+
+        if (
+            self.action == 'list'
+            and settings.EVENTS_FEED_UPCOMING_ONLY
+            and upcoming_param(self.request.query_params) is None
+        ):
+            queryset = queryset.filter(date__gte=timezone.now())
 
         lat = self.request.query_params.get('lat')
         lng = self.request.query_params.get('lng')
@@ -51,7 +104,11 @@ class EventViewSet(viewsets.ModelViewSet):
                 raise ValidationError({"detail": "lat and lng must be valid numbers."})
 
             point = LocationService.build_point(lat_value, lng_value)
-            queryset = queryset.annotate(distance=Distance('location', point))
+            queryset = queryset.annotate(
+                distance=Distance('location', point),
+                # <-> ordering is answered by walking events_location_gist_idx (KNN).
+                knn_distance=GeometryDistance('location', LocationService.geography_value(point)),
+            )
 
             if radius_km:
                 try:
@@ -60,20 +117,23 @@ class EventViewSet(viewsets.ModelViewSet):
                     raise ValidationError({"detail": "radius_km must be a valid number."})
                 if radius_value <= 0:
                     raise ValidationError({"detail": "radius_km must be greater than 0."})
-                queryset = queryset.filter(location__distance_lte=(point, D(km=radius_value)))
+                # dwithin compiles to ST_DWithin, which uses the GiST index;
+                # distance_lte compiles to ST_Distance <= r and scans every row.
+                queryset = queryset.filter(location__dwithin=(point, D(km=radius_value)))
 
         ordering = self.request.query_params.get('ordering')
         if ordering:
             if ordering == 'popular':
                 queryset = queryset.order_by('-participants_count', 'date')
-            elif ordering == 'soonest':
+            elif ordering in {'soonest', 'relevance'}:
+                # Relevance is applied by EventSearchFilter when searching.
                 queryset = queryset.order_by('date')
             elif ordering == 'newest':
                 queryset = queryset.order_by('-created_at')
             elif ordering == 'distance':
                 if lat is None or lng is None:
                     raise ValidationError({"detail": "lat and lng are required to order by distance."})
-                queryset = queryset.order_by('distance', 'date')
+                queryset = queryset.order_by('knn_distance', 'date')
             elif ordering in {'date', '-date', 'created_at', '-created_at'}:
                 queryset = queryset.order_by(ordering)
             else:
@@ -83,18 +143,122 @@ class EventViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def _upcoming_only(self) -> bool:
+        # Values EventFilter ignores fall back to the default, as in get_queryset.
+        value = upcoming_param(self.request.query_params)
+        if value is None:
+            return settings.EVENTS_FEED_UPCOMING_ONLY
+        return value
+
+    def list(self, request, *args, **kwargs):
+        # Answered before any query: the feed version changes on every write
+        # that can affect a feed page, and the time bucket caps how long a
+        # missed bump can keep a page cached by the client. Upcoming-only
+        # pages depend on the clock too, so their keys change every minute.
+        time_parts = [event_cache.time_bucket(event_cache.LIST_ETAG_TIMEOUT)]
+        if self._upcoming_only():
+            time_parts.append(event_cache.time_bucket(event_cache.UPCOMING_BUCKET_SECONDS))
+        etag = event_cache.etag(event_cache.FEED, request.query_params, request.user, *time_parts)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        # Anonymous feeds are identical for everyone with the same params;
+        # authenticated ones carry the per-user joined flag.
+        if request.user.is_authenticated:
+            response = super().list(request, *args, **kwargs)
+            response['ETag'] = etag
+            return response
+
+        key = event_cache.response_key(event_cache.FEED, request.query_params, *time_parts[1:])
+        data = event_cache.get_response(event_cache.FEED, key)
+        if data is not None:
+            return Response(data, headers={'ETag': etag})
+
+        response = super().list(request, *args, **kwargs)
+        event_cache.set_response(key, response.data)
+        response['ETag'] = etag
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        # One primary-key lookup instead of the annotated query plus roster.
+        try:
+            pk = int(kwargs.get('pk'))
+        except (TypeError, ValueError):
+            return super().retrieve(request, *args, **kwargs)
+        state = Event.objects.filter(pk=pk).values_list('updated_at', 'participants_count').first()
+        if state is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        updated_at, participants_count = state
+        etag = event_cache.etag(
+            event_cache.FEED, {}, request.user, pk, updated_at.isoformat(), participants_count
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        response = super().retrieve(request, *args, **kwargs)
+        response['ETag'] = etag
+        return response
+
+    @action(detail=False, methods=['get'], url_path='map', url_name='map')
+    def map_clusters(self, request):
+        bbox = MapClusterService.parse_bbox(request.query_params.get('bbox'))
+        zoom = MapClusterService.parse_zoom(request.query_params.get('zoom'))
+        queryset = self.filter_queryset(Event.objects.all())
+        # Per-cell cached buckets are only shared by unfiltered viewports.
+        use_cache = set(request.query_params) <= {'bbox', 'zoom'}
+        return Response(MapClusterService.cluster(queryset, bbox, zoom, use_cache=use_cache))
+
+    @action(
+        detail=False,
+        methods=['get'],
+        permission_classes=[permissions.AllowAny],
+        # Suggestions are the same for everyone; skip token decoding.
+        authentication_classes=[],
+    )
+    def suggest(self, request):
+        term = SuggestService.normalize(request.query_params.get('q'))
+        limit = SuggestService.parse_limit(request.query_params.get('limit'))
+        key = event_cache.suggest_key(term, limit)
+        data = event_cache.get_response(event_cache.SUGGEST, key)
+        if data is None:
+            data = SuggestService.suggest(term, limit)
+            event_cache.set_response(key, data, timeout=event_cache.SUGGEST_CACHE_TIMEOUT)
+        response = Response(data)
+        patch_cache_control(response, public=True, max_age=60)
+        return response
+
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
+    def perform_destroy(self, instance):
+        EventService.delete_event(instance)
+
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def join(self, request, pk=None):
         event = self.get_object()
         try:
             EventService.join_event(request.user, event)
             return Response({"detail": "Successfully joined the event."}, status=status.HTTP_201_CREATED)
+        except EventFullError:
+            pass
         except ValueError as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            entry = WaitlistService.enqueue(request.user, event)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        position = WaitlistService.position(entry)
+        if position is None:
+            # A slot opened up while enqueuing and the user was promoted.
+            return Response({"detail": "Successfully joined the event."}, status=status.HTTP_201_CREATED)
+        return Response(
+            {"detail": "Event is full. You have been added to the waitlist.", "waitlist_position": position},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def leave(self, request, pk=None):
         event = self.get_object()
@@ -110,11 +274,9 @@ class EventViewSet(viewsets.ModelViewSet):
                 if not (request.user.is_superuser or event.created_by_id == request.user.id):
                     return Response({"detail": "You do not have permission to remove this participant."}, status=status.HTTP_403_FORBIDDEN)
 
-            participation = Participation.objects.filter(event=event, user_id=target_user_id).first()
-            if not participation:
+            if not EventService.remove_participant(event, target_user_id):
                 return Response({"detail": "Participation not found."}, status=status.HTTP_404_NOT_FOUND)
 
-            participation.delete()
             return Response({"detail": "Successfully left the event."}, status=status.HTTP_204_NO_CONTENT)
 
         try:
@@ -128,3 +290,13 @@ class EventCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = EventCategory.objects.filter(is_active=True).order_by("name")
     serializer_class = EventCategorySerializer
     permission_classes = [permissions.AllowAny]
+
+    def list(self, request, *args, **kwargs):
+        key = event_cache.response_key(event_cache.CATEGORIES, request.query_params)
+        data = event_cache.get_response(event_cache.CATEGORIES, key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        event_cache.set_response(key, response.data)
+        return response
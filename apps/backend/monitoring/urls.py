@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import health_check
+from .views import cache_stats, health_check
 
 urlpatterns = [
     path('health/', health_check, name='health_check'),
+    path('health/cache/', cache_stats, name='cache_stats'),
 ]
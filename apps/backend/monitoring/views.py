@@ -1,6 +1,8 @@
 from django.http import JsonResponse
 from django.db import connection
 
+from events import cache as event_cache
+
 def health_check(request):
     try:
         with connection.cursor() as cursor:
@@ -8,3 +10,7 @@ def health_check(request):
         return JsonResponse({"status": "ok", "db": "connected"})
     except Exception as e:
         return JsonResponse({"status": "error", "db": str(e)}, status=500)
+
+
+def cache_stats(request):
+    return JsonResponse({"status": "ok", "cache": event_cache.stats()})
@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import Notification
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ("kind", "user", "event_id", "status", "created_at", "sent_at")
+    list_filter = ("kind", "status")
+    list_select_related = ("user",)
+    search_fields = ("dedupe_key",)
+    raw_id_fields = ("user",)
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.10 on 2026-10-18 19:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingEventNotification",
+            fields=[
+                ("event_id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("scheduled_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "notifications-pending",
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.db import models
+
+
+class Notification(models.Model):
+    """
+    Outbox of per-recipient messages. The unique dedupe_key makes fan-out
+    retries idempotent, and delivery only picks up pending rows.
+    """
+
+    class Meta:
+        db_table = "notifications-outbox"
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="notifications_status_idx"),
+        ]
+
+    EVENT_UPDATED = "event_updated"
+    WAITLIST_PROMOTED = "waitlist_promoted"
+    KIND_CHOICES = (
+        (EVENT_UPDATED, "Event updated"),
+        (WAITLIST_PROMOTED, "Promoted from waitlist"),
+    )
+
+    PENDING = "pending"
+    SENT = "sent"
+    STATUS_CHOICES = (
+        (PENDING, "Pending"),
+        (SENT, "Sent"),
+    )
+
+    dedupe_key = models.CharField(max_length=200, unique=True)
+    kind = models.CharField(max_length=40, choices=KIND_CHOICES)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="notifications",
+    )
+    event_id = models.BigIntegerField()
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind} -> {self.user_id} ({self.status})"
+
+
+class PendingEventNotification(models.Model):
+    """
+    One row per event with an update notice scheduled but not dispatched
+    yet. Kept in the database so the web process that claims it and the
+    worker that clears it agree whatever the cache backend.
+    """
+
+    class Meta:
+        db_table = "notifications-pending"
+
+    event_id = models.BigIntegerField(primary_key=True)
+    scheduled_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.event_id} @ {self.scheduled_at}"
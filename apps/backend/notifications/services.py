@@ -1,5 +1,195 @@
 from __future__ import annotations
 
+from typing import Any, Iterable
+
+from celery import current_app, group
+from django.db import connection, transaction
+from django.utils import timezone
+
+from events.models import Event, Participation
+from outbox.services import enqueue_task
+
+from .models import Notification, PendingEventNotification
+from .transports import get_transport
+
+EVENT_NOTIFICATION_TASK = "notifications.dispatch_event_notification"
+DELIVER_NOTIFICATIONS_TASK = "notifications.deliver_notifications"
+NOTIFICATIONS_QUEUE = "notifications"
+
+# Updates of the same event within this window become a single message.
+COALESCE_WINDOW = 60
+# Outbox rows written per INSERT while fanning out.
+FANOUT_BATCH_SIZE = 1000
+# Notifications handed to one delivery task.
+DELIVERY_BATCH_SIZE = 500
+
+
+def _batches(values: Iterable[Any], size: int):
+    batch = []
+    for value in values:
+        batch.append(value)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _claim_pending(event_id: int) -> bool:
+    # Inserts the event's pending row, or takes over one left behind by a
+    # dispatch that never ran; concurrent claims wait on the primary key.
+    table = connection.ops.quote_name(PendingEventNotification._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (event_id, scheduled_at) VALUES (%s, now())
+            ON CONFLICT (event_id) DO UPDATE SET scheduled_at = EXCLUDED.scheduled_at
+            WHERE {table}.scheduled_at < now() - make_interval(secs => %s)
+            RETURNING event_id
+            """,
+            [event_id, COALESCE_WINDOW * 2],
+        )
+        return cursor.fetchone() is not None
+
+
+def schedule_event_notification(event_id: int) -> bool:
+    """
+    Dispatch an update notice after COALESCE_WINDOW unless one is already
+    scheduled; later updates in the window ride along with it, since the
+    dispatch reads the event as it is when it runs. Call inside the
+    updating transaction.
+    """
+    if not _claim_pending(event_id):
+        return False
+    enqueue_task(
+        EVENT_NOTIFICATION_TASK,
+        args=[event_id],
+        queue=NOTIFICATIONS_QUEUE,
+        countdown=COALESCE_WINDOW,
+    )
+    return True
+
+
+def _write_outbox(kind: str, event_id: int, rows: Iterable[tuple[str, int]], payload: dict) -> list[int]:
+    """
+    Insert (dedupe_key, user_id) rows, skipping ones already written, and
+    return the ids of the pending notifications among them.
+    """
+    notification_ids = []
+    for batch in _batches(rows, FANOUT_BATCH_SIZE):
+        Notification.objects.bulk_create(
+            [
+                Notification(
+                    dedupe_key=dedupe_key,
+                    kind=kind,
+                    user_id=user_id,
+                    event_id=event_id,
+                    payload=payload,
+                )
+                for dedupe_key, user_id in batch
+            ],
+            ignore_conflicts=True,
+        )
+        notification_ids.extend(
+            Notification.objects.filter(
+                dedupe_key__in=[dedupe_key for dedupe_key, _ in batch],
+                status=Notification.PENDING,
+            ).values_list("id", flat=True)
+        )
+    return notification_ids
+
+
+def _enqueue_delivery(notification_ids: list[int]) -> int:
+    # One delivery task per batch, run in parallel by the notifications workers.
+    tasks = [
+        current_app.signature(
+            DELIVER_NOTIFICATIONS_TASK,
+            args=[batch],
+            queue=NOTIFICATIONS_QUEUE,
+        )
+        for batch in _batches(notification_ids, DELIVERY_BATCH_SIZE)
+    ]
+    if tasks:
+        group(tasks).apply_async()
+    return len(tasks)
+
 
 def dispatch_event_notification(event_id: int) -> dict[str, int | bool]:
-    return {"event_id": event_id, "dispatched": True}
+    """
+    Fan an event change out to its participants. Outbox rows are keyed on
+    the event's updated_at, so a retried or duplicate dispatch for the same
+    state writes and sends nothing new.
+    """
+    # Clear the marker first: an update landing after this point schedules
+    # its own dispatch instead of being lost.
+    PendingEventNotification.objects.filter(event_id=event_id).delete()
+    event = (
+        Event.objects.filter(pk=event_id)
+        .values("id", "title", "date", "city", "updated_at")
+        .first()
+    )
+    if event is None:
+        return {"event_id": event_id, "dispatched": False}
+
+    version = int(event["updated_at"].timestamp() * 1_000_000)
+    payload = {
+        "event_id": str(event_id),
+        "title": event["title"],
+        "date": event["date"].isoformat(),
+        "city": event["city"],
+    }
+    user_ids = (
+        Participation.objects.filter(event_id=event_id)
+        .order_by("id")
+        .values_list("user_id", flat=True)
+        .iterator(chunk_size=FANOUT_BATCH_SIZE)
+    )
+    rows = (
+        (f"{Notification.EVENT_UPDATED}:{event_id}:{version}:{user_id}", user_id)
+        for user_id in user_ids
+    )
+    notification_ids = _write_outbox(Notification.EVENT_UPDATED, event_id, rows, payload)
+    tasks = _enqueue_delivery(notification_ids)
+    return {"event_id": event_id, "dispatched": True, "notifications": len(notification_ids), "tasks": tasks}
+
+
+def dispatch_waitlist_promotions(event_id: int, user_ids: list[int]) -> dict[str, int]:
+    # Keyed on the participation, so a user promoted again after leaving
+    # gets a new notice while task retries do not.
+    participations = Participation.objects.filter(
+        event_id=event_id, user_id__in=user_ids
+    ).values_list("id", "user_id")
+    title = Event.objects.filter(pk=event_id).values_list("title", flat=True).first()
+    if title is None:
+        return {"event_id": event_id, "notified": 0}
+    payload = {"event_id": str(event_id), "title": title}
+    rows = (
+        (f"{Notification.WAITLIST_PROMOTED}:{event_id}:{participation_id}", user_id)
+        for participation_id, user_id in participations
+    )
+    notification_ids = _write_outbox(Notification.WAITLIST_PROMOTED, event_id, rows, payload)
+    # Promotions already arrive batched, so deliver them in this task.
+    delivered = deliver_notifications(notification_ids)
+    return {"event_id": event_id, "notified": delivered}
+
+
+@transaction.atomic
+def deliver_notifications(notification_ids: list[int]) -> int:
+    """
+    Send the still-pending notifications among the given ids and mark them
+    sent. Rows are locked with SKIP LOCKED so overlapping deliveries never
+    send the same row twice; a transport error rolls the batch back for the
+    task to retry.
+    """
+    notifications = list(
+        Notification.objects.select_for_update(skip_locked=True)
+        .filter(pk__in=notification_ids, status=Notification.PENDING)
+        .order_by("id")
+    )
+    if not notifications:
+        return 0
+    get_transport().send_many(notifications)
+    Notification.objects.filter(pk__in=[notification.pk for notification in notifications]).update(
+        status=Notification.SENT, sent_at=timezone.now()
+    )
+    return len(notifications)
@@ -1,6 +1,10 @@
 from celery import shared_task
 
-from .services import dispatch_event_notification
+from .services import (
+    deliver_notifications,
+    dispatch_event_notification,
+    dispatch_waitlist_promotions,
+)
 
 
 @shared_task(
@@ -11,3 +15,23 @@ from .services import dispatch_event_notification
 )
 def dispatch_event_notification_task(self, event_id: int):
     return dispatch_event_notification(event_id)
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 3, "countdown": 10},
+    name="notifications.dispatch_waitlist_promotions",
+)
+def dispatch_waitlist_promotions_task(self, event_id: int, user_ids: list[int]):
+    return dispatch_waitlist_promotions(event_id, user_ids)
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 3, "countdown": 10},
+    name="notifications.deliver_notifications",
+)
+def deliver_notifications_task(self, notification_ids: list[int]):
+    return deliver_notifications(notification_ids)
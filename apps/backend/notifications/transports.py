@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import logging
+from typing import Iterable
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class BaseTransport:
+    """Delivers a batch of outbox rows; raising makes the batch retry."""
+
+    def send_many(self, notifications: Iterable) -> None:
+        raise NotImplementedError
+
+
+class LoggingTransport(BaseTransport):
+    def send_many(self, notifications: Iterable) -> None:
+        for notification in notifications:
+            logger.info(
+                "Notification %s for user %s: %s",
+                notification.kind,
+                notification.user_id,
+                notification.payload,
+            )
+
+
+class InMemoryTransport(BaseTransport):
+    """
+    Local fake that only records what it was given, for tests and for
+    measuring pipeline throughput without an external provider.
+    """
+
+    sent: list[tuple[str, int, dict]] = []
+
+    def send_many(self, notifications: Iterable) -> None:
+        InMemoryTransport.sent.extend(
+            (notification.kind, notification.user_id, notification.payload)
+            for notification in notifications
+        )
+
+    @classmethod
+    def clear(cls) -> None:
+        cls.sent = []
+
+
+def get_transport() -> BaseTransport:
+    return import_string(settings.NOTIFICATIONS_TRANSPORT)()
@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import TaskOutbox
+
+
+@admin.register(TaskOutbox)
+class TaskOutboxAdmin(admin.ModelAdmin):
+    list_display = ("task_name", "task_id", "queue", "created_at", "published_at")
+    list_filter = ("task_name", "queue")
+    search_fields = ("task_id", "task_name")
+    readonly_fields = ("task_id", "created_at", "published_at")
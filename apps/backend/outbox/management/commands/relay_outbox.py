@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from outbox.services import RELAY_BATCH_SIZE, prune_published, relay
+
+
+class Command(BaseCommand):
+    help = "Publish tasks recorded in the outbox to the broker."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the pending tasks and exit instead of polling.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0.5,
+            help="Seconds to wait when the outbox is empty.",
+        )
+        parser.add_argument("--batch-size", type=int, default=RELAY_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        published = 0
+        last_prune = 0.0
+        while True:
+            sent = relay(options["batch_size"])
+            published += sent
+            if sent:
+                continue
+            if options["once"]:
+                break
+            if time.monotonic() - last_prune > 3600:
+                prune_published()
+                last_prune = time.monotonic()
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS(f"Published {published} task(s)."))
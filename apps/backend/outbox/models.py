@@ -0,0 +1,36 @@
+import uuid
+
+from django.db import models
+from django.db.models import Q
+
+
+class TaskOutbox(models.Model):
+    """
+    Celery task waiting to be published. Rows are written in the caller's
+    transaction, so a task exists exactly when the data it refers to was
+    committed; the relay publishes them afterwards.
+    """
+
+    class Meta:
+        db_table = "outbox-tasks"
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=Q(published_at__isnull=True),
+                name="outbox_tasks_pending_idx",
+            ),
+            models.Index(fields=["published_at"], name="outbox_tasks_published_idx"),
+        ]
+
+    # Assigned up front so callers can link to the result before publication.
+    task_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    task_name = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    queue = models.CharField(max_length=50)
+    eta = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.task_name} ({self.task_id})"
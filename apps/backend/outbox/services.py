@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any, Iterable
+
+from celery import current_app
+from django.db import transaction
+from django.utils import timezone
+
+from .models import TaskOutbox
+
+# Rows published per relay transaction.
+RELAY_BATCH_SIZE = 500
+# Published rows are kept this long for the admin, then pruned.
+RETENTION = timedelta(days=7)
+
+
+def enqueue_task(
+    task_name: str,
+    *,
+    args: list[Any] | None = None,
+    kwargs: dict[str, Any] | None = None,
+    queue: str,
+    countdown: int | None = None,
+) -> str:
+    """
+    Record a task for the relay and return its id. Call it inside the
+    transaction whose changes the task depends on; nothing touches the
+    broker here.
+    """
+    return enqueue_tasks(task_name, [args or []], kwargs=kwargs, queue=queue, countdown=countdown)[0]
+
+
+def enqueue_tasks(
+    task_name: str,
+    args_list: Iterable[list[Any]],
+    *,
+    kwargs: dict[str, Any] | None = None,
+    queue: str,
+    countdown: int | None = None,
+) -> list[str]:
+    """Record one task per args list with a single INSERT."""
+    eta = timezone.now() + timedelta(seconds=countdown) if countdown else None
+    rows = TaskOutbox.objects.bulk_create(
+        [
+            TaskOutbox(task_name=task_name, args=args, kwargs=kwargs or {}, queue=queue, eta=eta)
+            for args in args_list
+        ]
+    )
+    return [str(row.task_id) for row in rows]
+
+
+def relay(batch_size: int = RELAY_BATCH_SIZE) -> int:
+    """
+    Publish one batch of pending tasks over a single broker connection and
+    mark them published. SKIP LOCKED lets several relays run side by side.
+    If publishing fails midway the batch is retried, so delivery is at least
+    once and tasks must tolerate duplicates.
+    """
+    with transaction.atomic():
+        rows = list(
+            TaskOutbox.objects.select_for_update(skip_locked=True)
+            .filter(published_at__isnull=True)
+            .order_by("id")[:batch_size]
+        )
+        if not rows:
+            return 0
+        with current_app.producer_or_acquire() as producer:
+            for row in rows:
+                current_app.send_task(
+                    row.task_name,
+                    args=row.args,
+                    kwargs=row.kwargs,
+                    queue=row.queue,
+                    eta=row.eta,
+                    task_id=str(row.task_id),
+                    producer=producer,
+                )
+        TaskOutbox.objects.filter(pk__in=[row.pk for row in rows]).update(
+            published_at=timezone.now()
+        )
+    return len(rows)
+
+
+def prune_published() -> int:
+    deleted, _ = TaskOutbox.objects.filter(
+        published_at__lt=timezone.now() - RETENTION
+    ).delete()
+    return deleted
@@ -0,0 +1,33 @@
+from django.contrib import admin
+
+from .models import EventScore, LeaderboardEntry, RankingWatermark, UserScore
+
+
+@admin.register(EventScore)
+class EventScoreAdmin(admin.ModelAdmin):
+    list_display = ("event", "score", "velocity", "fill_ratio", "recency", "popularity", "computed_at")
+    list_select_related = ("event",)
+    ordering = ("-score",)
+    raw_id_fields = ("event",)
+
+
+@admin.register(UserScore)
+class UserScoreAdmin(admin.ModelAdmin):
+    list_display = ("user", "score", "games_played", "recent_games", "events_created", "computed_at")
+    list_select_related = ("user",)
+    ordering = ("-score",)
+    raw_id_fields = ("user",)
+
+
+@admin.register(RankingWatermark)
+class RankingWatermarkAdmin(admin.ModelAdmin):
+    list_display = ("name", "last_change_id", "updated_at")
+
+
+@admin.register(LeaderboardEntry)
+class LeaderboardEntryAdmin(admin.ModelAdmin):
+    list_display = ("board", "key", "user", "games_played", "updated_at")
+    list_filter = ("board",)
+    list_select_related = ("user",)
+    search_fields = ("key",)
+    raw_id_fields = ("user",)
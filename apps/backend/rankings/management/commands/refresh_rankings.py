@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from rankings.services import rebuild_leaderboards, refresh_rankings, rescore_all
+
+
+class Command(BaseCommand):
+    help = "Rescore events and users and update leaderboards from changes since the last refresh."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rescore every event and user instead of reading the change log.",
+        )
+        parser.add_argument(
+            "--rebuild-leaderboards",
+            action="store_true",
+            help="Recompute every leaderboard from participations.",
+        )
+
+    def handle(self, *args, **options):
+        if options["full"]:
+            result = rescore_all()
+            self.stdout.write(
+                self.style.SUCCESS(f"Scored {result['events']} event(s) and {result['users']} user(s).")
+            )
+        if options["rebuild_leaderboards"]:
+            entries = rebuild_leaderboards()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt leaderboards with {entries} entry(ies)."))
+        if options["full"] or options["rebuild_leaderboards"]:
+            return
+
+        result = refresh_rankings()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {result['changes']} change(s): "
+                f"{result['events']} event(s), {result['users']} user(s) rescored, "
+                f"{result['leaderboard_changes']} change(s) applied to leaderboards, "
+                f"{result['pruned']} pruned."
+            )
+        )
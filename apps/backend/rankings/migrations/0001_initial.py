@@ -0,0 +1,103 @@
+# Generated by Django 5.2.10 on 2026-10-18 16:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("events", "0011_event_geohash"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ParticipationChange",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("event_id", models.BigIntegerField()),
+                ("user_id", models.BigIntegerField()),
+                ("delta", models.SmallIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "rankings-participation-changes",
+            },
+        ),
+        migrations.CreateModel(
+            name="RankingWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("last_change_id", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "rankings-watermarks",
+            },
+        ),
+        migrations.CreateModel(
+            name="EventScore",
+            fields=[
+                (
+                    "event",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="ranking_score",
+                        serialize=False,
+                        to="events.event",
+                    ),
+                ),
+                ("score", models.FloatField(default=0)),
+                ("velocity", models.FloatField(default=0)),
+                ("fill_ratio", models.FloatField(default=0)),
+                ("recency", models.FloatField(default=0)),
+                ("popularity", models.FloatField(default=0)),
+                ("computed_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "rankings-event-scores",
+                "indexes": [
+                    models.Index(fields=["-score"], name="rankings_event_score_idx"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="UserScore",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="ranking_score",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("score", models.FloatField(default=0)),
+                ("games_played", models.IntegerField(default=0)),
+                ("recent_games", models.IntegerField(default=0)),
+                ("events_created", models.IntegerField(default=0)),
+                ("computed_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "rankings-user-scores",
+                "indexes": [
+                    models.Index(fields=["-score"], name="rankings_user_score_idx"),
+                ],
+            },
+        ),
+    ]
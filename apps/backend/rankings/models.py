@@ -0,0 +1,136 @@
+from django.conf import settings
+from django.db import models
+
+
+class ParticipationChange(models.Model):
+    """
+    Append-only log of participation changes, written in the same transaction
+    as the change itself. Refreshes consume it past their watermark instead
+    of rescanning participations. Ids are plain integers so the log outlives
+    deleted events and users.
+    """
+
+    class Meta:
+        db_table = "rankings-participation-changes"
+
+    JOINED = 1
+    LEFT = -1
+    # Touches the event's score without changing any count (e.g. creation).
+    TOUCHED = 0
+
+    id = models.BigAutoField(primary_key=True)
+    event_id = models.BigIntegerField()
+    user_id = models.BigIntegerField()
+    delta = models.SmallIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"#{self.id} event={self.event_id} user={self.user_id} {self.delta:+d}"
+
+
+class RankingWatermark(models.Model):
+    """Last ParticipationChange id processed by each refresh."""
+
+    class Meta:
+        db_table = "rankings-watermarks"
+
+    name = models.CharField(max_length=50, unique=True)
+    last_change_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_change_id}"
+
+
+class EventScore(models.Model):
+    class Meta:
+        db_table = "rankings-event-scores"
+        indexes = [
+            models.Index(fields=["-score"], name="rankings_event_score_idx"),
+        ]
+
+    event = models.OneToOneField(
+        "events.Event",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="ranking_score",
+    )
+    score = models.FloatField(default=0)
+    # Joins per hour over the velocity window.
+    velocity = models.FloatField(default=0)
+    fill_ratio = models.FloatField(default=0)
+    recency = models.FloatField(default=0)
+    popularity = models.FloatField(default=0)
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.event_id}: {self.score:.3f}"
+
+
+class UserScore(models.Model):
+    class Meta:
+        db_table = "rankings-user-scores"
+        indexes = [
+            models.Index(fields=["-score"], name="rankings_user_score_idx"),
+        ]
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="ranking_score",
+    )
+    score = models.FloatField(default=0)
+    games_played = models.IntegerField(default=0)
+    recent_games = models.IntegerField(default=0)
+    events_created = models.IntegerField(default=0)
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user_id}: {self.score:.3f}"
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Materialized games played per user within a board (a city, a category or
+    a month). Maintained incrementally from the change log, so reads are a
+    plain index scan.
+    """
+
+    class Meta:
+        db_table = "rankings-leaderboard-entries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["board", "key", "user"],
+                name="rankings_leaderboard_entry_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["board", "key", "-games_played"],
+                name="rankings_leaderboard_top_idx",
+            ),
+        ]
+
+    CITY = "city"
+    CATEGORY = "category"
+    MONTH = "month"
+    BOARD_CHOICES = (
+        (CITY, "City"),
+        (CATEGORY, "Category"),
+        (MONTH, "Month"),
+    )
+
+    board = models.CharField(max_length=20, choices=BOARD_CHOICES)
+    # Lowercased city, category id or YYYY-MM of the event date.
+    key = models.CharField(max_length=120)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="leaderboard_entries",
+    )
+    games_played = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.board}:{self.key} {self.user_id} ({self.games_played})"
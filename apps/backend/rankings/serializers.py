@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from rest_framework import serializers
+
+from .models import EventScore, LeaderboardEntry, UserScore
+
+User = get_user_model()
+
+
+class RankedUserSerializer(serializers.ModelSerializer):
+    id = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = User
+        fields = ('id', 'username', 'avatar_url')
+
+
+class UserScoreSerializer(serializers.ModelSerializer):
+    user = RankedUserSerializer(read_only=True)
+
+    class Meta:
+        model = UserScore
+        fields = ('user', 'score', 'games_played', 'recent_games', 'events_created', 'computed_at')
+
+
+class EventScoreSerializer(serializers.ModelSerializer):
+    event_id = serializers.CharField(source='event.id', read_only=True)
+    title = serializers.CharField(source='event.title', read_only=True)
+    date = serializers.DateTimeField(source='event.date', read_only=True)
+    city = serializers.CharField(source='event.city', read_only=True)
+
+    class Meta:
+        model = EventScore
+        fields = (
+            'event_id', 'title', 'date', 'city', 'score',
+            'velocity', 'fill_ratio', 'recency', 'popularity', 'computed_at',
+        )
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    user = RankedUserSerializer(read_only=True)
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = ('user', 'games_played')
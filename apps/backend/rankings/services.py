@@ -1,5 +1,399 @@
 from __future__ import annotations
 
+import math
+from datetime import timedelta
+from typing import Iterable, Iterator
 
-def refresh_rankings() -> dict[str, bool]:
-    return {"refreshed": True}
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Count, Max, Min
+from django.utils import timezone
+
+from events.models import Event, EventHistory, Participation, ParticipationHistory
+
+from .models import (
+    EventScore,
+    LeaderboardEntry,
+    ParticipationChange,
+    RankingWatermark,
+    UserScore,
+)
+
+User = get_user_model()
+
+SCORES_WATERMARK = "scores"
+LEADERBOARDS_WATERMARK = "leaderboards"
+# Change rows consumed per refresh transaction.
+CHANGE_BATCH_SIZE = 5000
+# Events or users scored per round-trip.
+SCORE_BATCH_SIZE = 1000
+# Changes newer than this are left for the next run: ids are assigned at
+# insert, so a slower transaction can still commit a lower id.
+COMMIT_GRACE = timedelta(seconds=30)
+
+VELOCITY_WINDOW = timedelta(hours=24)
+RECENCY_HALF_LIFE_HOURS = 72
+EVENT_WEIGHTS = {
+    "velocity": 3.0,
+    "fill_ratio": 2.0,
+    "recency": 1.5,
+    "popularity": 1.0,
+}
+
+# board -> (key expression over the event row, rows included)
+LEADERBOARD_KEYS = {
+    LeaderboardEntry.CITY: ("lower(e.city)", "e.city <> ''"),
+    LeaderboardEntry.CATEGORY: ("e.category_id::text", "TRUE"),
+    LeaderboardEntry.MONTH: ("to_char(e.date AT TIME ZONE 'UTC', 'YYYY-MM')", "TRUE"),
+}
+
+RECENT_GAMES_WINDOW = timedelta(days=30)
+USER_WEIGHTS = {
+    "games_played": 1.0,
+    "recent_games": 2.0,
+    "events_created": 0.5,
+}
+
+
+def _chunks(values: Iterable[int], size: int) -> Iterator[list[int]]:
+    chunk: list[int] = []
+    for value in values:
+        chunk.append(value)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def record_changes(event_id: int, user_ids: Iterable[int], delta: int) -> None:
+    """Append change rows; call inside the transaction making the change."""
+    ParticipationChange.objects.bulk_create(
+        [
+            ParticipationChange(event_id=event_id, user_id=user_id, delta=delta)
+            for user_id in user_ids
+        ]
+    )
+
+
+def score_events(event_ids: Iterable[int], now=None) -> int:
+    """
+    Recompute EventScore for the given events, one grouped query and one
+    upsert per batch. Deleted events are skipped.
+    """
+    now = now or timezone.now()
+    written = 0
+    for batch in _chunks(sorted(set(event_ids)), SCORE_BATCH_SIZE):
+        recent_joins = dict(
+            Participation.objects.filter(
+                event_id__in=batch, joined_at__gte=now - VELOCITY_WINDOW
+            )
+            .order_by()
+            .values("event_id")
+            .annotate(joins=Count("id"))
+            .values_list("event_id", "joins")
+        )
+        window_hours = VELOCITY_WINDOW.total_seconds() / 3600
+
+        scores = []
+        for event_id, slots, participants_count, created_at in Event.objects.filter(
+            pk__in=batch
+        ).values_list("id", "slots", "participants_count", "created_at"):
+            age_hours = max((now - created_at).total_seconds() / 3600, 0)
+            velocity = recent_joins.get(event_id, 0) / window_hours
+            fill_ratio = min(participants_count / slots, 1.0) if slots else 0.0
+            recency = 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+            # Independent of the viewer's location, unlike the feed's distance.
+            popularity = math.log1p(participants_count)
+            score = (
+                EVENT_WEIGHTS["velocity"] * math.log1p(velocity)
+                + EVENT_WEIGHTS["fill_ratio"] * fill_ratio
+                + EVENT_WEIGHTS["recency"] * recency
+                + EVENT_WEIGHTS["popularity"] * popularity
+            )
+            scores.append(
+                EventScore(
+                    event_id=event_id,
+                    score=score,
+                    velocity=velocity,
+                    fill_ratio=fill_ratio,
+                    recency=recency,
+                    popularity=popularity,
+                    computed_at=now,
+                )
+            )
+
+        EventScore.objects.bulk_create(
+            scores,
+            update_conflicts=True,
+            unique_fields=["event"],
+            update_fields=["score", "velocity", "fill_ratio", "recency", "popularity", "computed_at"],
+        )
+        written += len(scores)
+    return written
+
+
+def score_users(user_ids: Iterable[int], now=None) -> int:
+    """Recompute UserScore for the given users, batched like score_events."""
+    now = now or timezone.now()
+    written = 0
+    for batch in _chunks(sorted(set(user_ids)), SCORE_BATCH_SIZE):
+        recent_games = dict(
+            Participation.objects.filter(
+                user_id__in=batch, joined_at__gte=now - RECENT_GAMES_WINDOW
+            )
+            .order_by()
+            .values("user_id")
+            .annotate(games=Count("id"))
+            .values_list("user_id", "games")
+        )
+        events_created = dict(
+            Event.objects.filter(created_by_id__in=batch)
+            .order_by()
+            .values("created_by_id")
+            .annotate(events=Count("id"))
+            .values_list("created_by_id", "events")
+        )
+
+        scores = []
+        for user_id, games_played in User.objects.filter(pk__in=batch).values_list(
+            "id", "games_played_count"
+        ):
+            recent = recent_games.get(user_id, 0)
+            created = events_created.get(user_id, 0)
+            scores.append(
+                UserScore(
+                    user_id=user_id,
+                    score=(
+                        USER_WEIGHTS["games_played"] * games_played
+                        + USER_WEIGHTS["recent_games"] * recent
+                        + USER_WEIGHTS["events_created"] * created
+                    ),
+                    games_played=games_played,
+                    recent_games=recent,
+                    events_created=created,
+                    computed_at=now,
+                )
+            )
+
+        UserScore.objects.bulk_create(
+            scores,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=["score", "games_played", "recent_games", "events_created", "computed_at"],
+        )
+        written += len(scores)
+    return written
+
+
+def _lock_watermark(name: str) -> RankingWatermark:
+    # The locked row keeps concurrent refreshes from processing the same
+    # changes; call inside a transaction.
+    watermark, _ = RankingWatermark.objects.select_for_update().get_or_create(name=name)
+    return watermark
+
+
+def _pending_changes(watermark: RankingWatermark, now):
+    return ParticipationChange.objects.filter(
+        id__gt=watermark.last_change_id,
+        created_at__lt=now - COMMIT_GRACE,
+    ).order_by("id")
+
+
+def refresh_scores(batch_size: int = CHANGE_BATCH_SIZE) -> dict[str, int]:
+    """
+    Rescore the events and users touched since the last run. Each batch of
+    changes is scored and the watermark advanced in one transaction, so an
+    interrupted refresh resumes where it stopped.
+    """
+    processed = events = users = 0
+    while True:
+        with transaction.atomic():
+            now = timezone.now()
+            watermark = _lock_watermark(SCORES_WATERMARK)
+            changes = list(
+                _pending_changes(watermark, now).values_list("id", "event_id", "user_id")[:batch_size]
+            )
+            if not changes:
+                break
+
+            events += score_events({event_id for _, event_id, _ in changes}, now)
+            users += score_users({user_id for _, _, user_id in changes}, now)
+            watermark.last_change_id = changes[-1][0]
+            watermark.save(update_fields=["last_change_id", "updated_at"])
+            processed += len(changes)
+
+    return {"changes": processed, "events": events, "users": users}
+
+
+def _leaderboard_sql(source: str, board: str) -> str:
+    key, condition = LEADERBOARD_KEYS[board]
+    table = connection.ops.quote_name(LeaderboardEntry._meta.db_table)
+    events = connection.ops.quote_name(Event._meta.db_table)
+    users = connection.ops.quote_name(User._meta.db_table)
+    if source == "retract":
+        # Negated count of each participant's games already folded into the
+        # boards: a current participation minus its still pending deltas.
+        rows = f"""
+            SELECT %s, {key}, f.user_id, -SUM(f.folded), now()
+            FROM (
+                SELECT s.event_id, s.user_id, SUM(s.games) AS folded
+                FROM (
+                    SELECT event_id, user_id, 1 AS games
+                    FROM {connection.ops.quote_name(Participation._meta.db_table)}
+                    WHERE event_id = ANY(%s)
+                    UNION ALL
+                    SELECT event_id, user_id, -delta
+                    FROM {connection.ops.quote_name(ParticipationChange._meta.db_table)}
+                    WHERE event_id = ANY(%s) AND id > %s
+                ) s
+                GROUP BY s.event_id, s.user_id
+            ) f
+            JOIN {events} e ON e.id = f.event_id
+            JOIN {users} u ON u.id = f.user_id
+            WHERE {condition}
+            GROUP BY 2, f.user_id
+            HAVING SUM(f.folded) <> 0
+        """
+    elif source == "changes":
+        rows = f"""
+            SELECT %s, {key}, c.user_id, SUM(c.delta), now()
+            FROM {connection.ops.quote_name(ParticipationChange._meta.db_table)} c
+            JOIN {events} e ON e.id = c.event_id
+            JOIN {users} u ON u.id = c.user_id
+            WHERE c.id > %s AND c.id <= %s AND c.delta <> 0 AND {condition}
+            GROUP BY 2, c.user_id
+            HAVING SUM(c.delta) <> 0
+        """
+    else:
+        # Live and archived games alike: the incremental boards folded in
+        # the archived ones before they were moved to history.
+        rows = f"""
+            SELECT %s, {key}, e.user_id, COUNT(*), now()
+            FROM (
+                SELECT p.user_id, le.city, le.category_id, le.date
+                FROM {connection.ops.quote_name(Participation._meta.db_table)} p
+                JOIN {events} le ON le.id = p.event_id
+                UNION ALL
+                SELECT hp.user_id, he.city, he.category_id, he.date
+                FROM {connection.ops.quote_name(ParticipationHistory._meta.db_table)} hp
+                JOIN {connection.ops.quote_name(EventHistory._meta.db_table)} he
+                    ON he.id = hp.event_id AND he.date = hp.event_date
+            ) e
+            JOIN {users} u ON u.id = e.user_id
+            WHERE {condition}
+            GROUP BY 2, e.user_id
+        """
+    return f"""
+        INSERT INTO {table} (board, key, user_id, games_played, updated_at)
+        {rows}
+        ON CONFLICT (board, key, user_id) DO UPDATE
+        SET games_played = {table}.games_played + EXCLUDED.games_played,
+            updated_at = EXCLUDED.updated_at
+    """
+
+
+def refresh_leaderboards(batch_size: int = CHANGE_BATCH_SIZE) -> int:
+    """
+    Fold the changes since the leaderboard watermark into the materialized
+    boards: one grouped INSERT ... ON CONFLICT per board and batch, adding
+    each user's net delta to the stored count. Events are read as they are
+    now, so a city or category edit only affects later changes.
+    """
+    processed = 0
+    while True:
+        with transaction.atomic():
+            watermark = _lock_watermark(LEADERBOARDS_WATERMARK)
+            change_ids = list(
+                _pending_changes(watermark, timezone.now()).values_list("id", flat=True)[:batch_size]
+            )
+            if not change_ids:
+                break
+
+            with connection.cursor() as cursor:
+                for board in LEADERBOARD_KEYS:
+                    cursor.execute(
+                        _leaderboard_sql("changes", board),
+                        [board, watermark.last_change_id, change_ids[-1]],
+                    )
+            watermark.last_change_id = change_ids[-1]
+            watermark.save(update_fields=["last_change_id", "updated_at"])
+            processed += len(change_ids)
+    return processed
+
+
+@transaction.atomic
+def retract_leaderboards(event_ids: list[int]) -> None:
+    """
+    Take the games of events about to be deleted out of the boards. Once an
+    event is gone its change rows no longer resolve to a board key and the
+    refresh skips them, so whatever was already folded in is subtracted
+    here. Call in the deleting transaction, before logging the LEFT rows.
+    """
+    watermark = _lock_watermark(LEADERBOARDS_WATERMARK)
+    with connection.cursor() as cursor:
+        for board in LEADERBOARD_KEYS:
+            cursor.execute(
+                _leaderboard_sql("retract", board),
+                [board, event_ids, event_ids, watermark.last_change_id],
+            )
+
+
+@transaction.atomic
+def rebuild_leaderboards() -> int:
+    """
+    Recompute every board from live and archived participations and reset
+    the watermark.
+    """
+    watermark = _lock_watermark(LEADERBOARDS_WATERMARK)
+    LeaderboardEntry.objects.all().delete()
+    with connection.cursor() as cursor:
+        for board in LEADERBOARD_KEYS:
+            cursor.execute(_leaderboard_sql("participations", board), [board])
+    watermark.last_change_id = (
+        ParticipationChange.objects.aggregate(last=Max("id"))["last"] or 0
+    )
+    watermark.save(update_fields=["last_change_id", "updated_at"])
+    return LeaderboardEntry.objects.count()
+
+
+def prune_changes() -> int:
+    """Delete change rows every refresh has already consumed."""
+    names = (SCORES_WATERMARK, LEADERBOARDS_WATERMARK)
+    watermarks = RankingWatermark.objects.filter(name__in=names).aggregate(
+        total=Count("id"), lowest=Min("last_change_id")
+    )
+    if watermarks["total"] < len(names):
+        return 0
+    deleted, _ = ParticipationChange.objects.filter(id__lte=watermarks["lowest"]).delete()
+    return deleted
+
+
+def refresh_rankings(batch_size: int = CHANGE_BATCH_SIZE) -> dict[str, int]:
+    result = refresh_scores(batch_size)
+    result["leaderboard_changes"] = refresh_leaderboards(batch_size)
+    result["pruned"] = prune_changes()
+    return result
+
+
+def rescore_all() -> dict[str, int]:
+    """
+    Score every event and user. Used to seed the tables and to let recency
+    decay on events that saw no changes.
+    """
+    now = timezone.now()
+    events = sum(
+        score_events(batch, now)
+        for batch in _chunks(
+            Event.objects.order_by("id").values_list("id", flat=True).iterator(chunk_size=SCORE_BATCH_SIZE),
+            SCORE_BATCH_SIZE,
+        )
+    )
+    users = sum(
+        score_users(batch, now)
+        for batch in _chunks(
+            User.objects.order_by("id").values_list("id", flat=True).iterator(chunk_size=SCORE_BATCH_SIZE),
+            SCORE_BATCH_SIZE,
+        )
+    )
+    return {"events": events, "users": users}
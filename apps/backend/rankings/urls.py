@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import EventRankingView, LeaderboardView, PlayerRankingView
+
+urlpatterns = [
+    path('players/', PlayerRankingView.as_view(), name='ranking-players'),
+    path('events/', EventRankingView.as_view(), name='ranking-events'),
+    path('leaderboards/<str:board>/<str:key>/', LeaderboardView.as_view(), name='ranking-leaderboard'),
+]
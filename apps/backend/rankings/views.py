@@ -0,0 +1,69 @@
+import re
+
+from django.http import Http404
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+
+from events.models import EventCategory
+
+from .models import EventScore, LeaderboardEntry, UserScore
+from .pagination import RankingPagination
+from .serializers import EventScoreSerializer, LeaderboardEntrySerializer, UserScoreSerializer
+
+MONTH_RE = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+
+class RankedListView(generics.ListAPIView):
+    """Lists served straight from the ranking tables, numbered by position."""
+
+    pagination_class = RankingPagination
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        offset = self.paginator.offset
+        for position, item in enumerate(response.data['results'], start=offset + 1):
+            item['rank'] = position
+        return response
+
+
+class PlayerRankingView(RankedListView):
+    serializer_class = UserScoreSerializer
+
+    def get_queryset(self):
+        return UserScore.objects.select_related('user').order_by('-score', 'user_id')
+
+
+class EventRankingView(RankedListView):
+    serializer_class = EventScoreSerializer
+
+    def get_queryset(self):
+        return EventScore.objects.select_related('event').order_by('-score', 'event_id')
+
+
+class LeaderboardView(RankedListView):
+    serializer_class = LeaderboardEntrySerializer
+
+    def get_board_key(self):
+        board = self.kwargs['board']
+        key = self.kwargs['key'].strip()
+        if board == LeaderboardEntry.CITY:
+            return board, key.lower()
+        if board == LeaderboardEntry.CATEGORY:
+            lookup = {'pk': int(key)} if key.isdigit() else {'slug': key}
+            category_id = EventCategory.objects.filter(**lookup).values_list('id', flat=True).first()
+            if category_id is None:
+                raise Http404("Category not found.")
+            return board, str(category_id)
+        if board == LeaderboardEntry.MONTH:
+            if not MONTH_RE.match(key):
+                raise ValidationError({"detail": "Use a month in YYYY-MM format."})
+            return board, key
+        raise Http404("Unknown leaderboard.")
+
+    def get_queryset(self):
+        board, key = self.get_board_key()
+        return (
+            LeaderboardEntry.objects.filter(board=board, key=key, games_played__gt=0)
+            .select_related('user')
+            .order_by('-games_played', 'user_id')
+        )
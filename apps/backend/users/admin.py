@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .models import User
+from .services import UserService
 
 class CustomUserAdmin(UserAdmin):
     fieldsets = UserAdmin.fieldsets + (
@@ -11,4 +12,15 @@ class CustomUserAdmin(UserAdmin):
     )
     list_display = UserAdmin.list_display + ('games_played_count',)
 
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        # Edited columns only, so a stale games_played_count is never
+        # written back; many-to-many fields are saved by save_related.
+        obj.save(update_fields=[
+            name for name in form.changed_data
+            if not obj._meta.get_field(name).many_to_many
+        ])
+        UserService.invalidate_feed(form.changed_data)
+
 admin.site.register(User, CustomUserAdmin)
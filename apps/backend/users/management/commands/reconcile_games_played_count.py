@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from events.models import Participation, ParticipationHistory
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Recompute User.games_played_count for users that drifted from their participations."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drifted users without updating them.",
+        )
+
+    def handle(self, *args, **options):
+        # Archived games still count, so history rows are included.
+        actual_count = Coalesce(
+            Subquery(
+                Participation.objects.filter(user=OuterRef("pk"))
+                .order_by()
+                .values("user")
+                .annotate(total=Count("id"))
+                .values("total")
+            ),
+            0,
+        ) + Coalesce(
+            Subquery(
+                ParticipationHistory.objects.filter(user_id=OuterRef("pk"))
+                .order_by()
+                .values("user_id")
+                .annotate(total=Count("id"))
+                .values("total")
+            ),
+            0,
+        )
+        drifted = User.objects.annotate(actual_count=actual_count).exclude(
+            games_played_count=F("actual_count")
+        )
+
+        if options["dry_run"]:
+            for user_id, stored, actual in drifted.values_list(
+                "id", "games_played_count", "actual_count"
+            ).iterator():
+                self.stdout.write(f"User {user_id}: stored={stored} actual={actual}")
+            return
+
+        updated = User.objects.filter(pk__in=drifted.values("pk")).update(
+            games_played_count=actual_count
+        )
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {updated} user(s)."))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.10 on 2026-10-18 14:00
+
+from django.db import migrations, models
+
+
+BACKFILL_GAMES_PLAYED_COUNT = """
+UPDATE "users"
+SET "games_played_count" = counts.total
+FROM (
+    SELECT "user_id", COUNT(*) AS total
+    FROM "events-participation"
+    GROUP BY "user_id"
+) AS counts
+WHERE "users"."id" = counts."user_id";
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0004_alter_user_options_alter_user_id_alter_user_table"),
+        ("events", "0008_alter_event_id_alter_participation_id_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="games_played_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_GAMES_PLAYED_COUNT, migrations.RunSQL.noop),
+    ]
@@ -11,7 +11,5 @@ class User(AbstractUser):
     bio = models.TextField(max_length=500, blank=True)
     avatar_url = models.URLField(max_length=500, blank=True)
     favorite_sports = models.JSONField(default=list, blank=True)
-
-    @property
-    def games_played_count(self):
-        return self.participations.count()
+    # Denormalized count of participations, kept in sync by EventService.
+    games_played_count = models.IntegerField(default=0, editable=False)
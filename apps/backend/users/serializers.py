@@ -11,34 +11,54 @@ class UserSafeSerializer(serializers.ModelSerializer):
         fields = ('id', 'username', 'email', 'avatar_url')
 
 class UserSerializer(serializers.ModelSerializer):
+    # Profiles show the most relevant events only; heavy players would
+    # otherwise pull their whole history on every profile view.
+    UPCOMING_EVENTS_LIMIT = 20
+    PAST_EVENTS_LIMIT = 20
+
     id = serializers.CharField(read_only=True)
     games_played_count = serializers.ReadOnlyField()
     upcoming_events = serializers.SerializerMethodField()
     past_events = serializers.SerializerMethodField()
+    past_events_count = serializers.SerializerMethodField()
 
     class Meta:
         model = User
         fields = (
             'id', 'username', 'email', 'bio', 'avatar_url', 
             'favorite_sports', 'games_played_count', 
-            'upcoming_events', 'past_events'
+            'upcoming_events', 'past_events', 'past_events_count'
+        )
+
+    def _participated_events(self, obj):
+        from events.models import Event
+        request = self.context.get('request')
+        return (
+            Event.objects.filter(participations__user=obj)
+            .select_related('category', 'created_by')
+            .with_user_joined(getattr(request, 'user', None))
         )
 
     def get_upcoming_events(self, obj):
-        from events.serializers import EventSerializer
+        from events.serializers import EventListSerializer
         from django.utils import timezone
-        participations = obj.participations.filter(event__date__gte=timezone.now()).order_by('event__date')
-        events = [p.event for p in participations]
-        # Important: Passes context to ensure nested requests work, 
-        # but EventSerializer now uses UserSafeSerializer internally.
-        return EventSerializer(events, many=True, context=self.context).data
+        events = self._participated_events(obj).filter(date__gte=timezone.now()).order_by('date')
+        return EventListSerializer(events[:self.UPCOMING_EVENTS_LIMIT], many=True, context=self.context).data
 
     def get_past_events(self, obj):
-        from events.serializers import EventSerializer
+        from events.serializers import EventListSerializer
         from django.utils import timezone
-        participations = obj.participations.filter(event__date__lt=timezone.now()).order_by('-event__date')
-        events = [p.event for p in participations]
-        return EventSerializer(events, many=True, context=self.context).data
+        events = self._participated_events(obj).filter(date__lt=timezone.now()).order_by('-date')
+        return EventListSerializer(events[:self.PAST_EVENTS_LIMIT], many=True, context=self.context).data
+
+    def get_past_events_count(self, obj):
+        from django.utils import timezone
+        from events.models import ParticipationHistory
+        # Archived events live in the history tables and are all past.
+        return (
+            obj.participations.filter(event__date__lt=timezone.now()).count()
+            + ParticipationHistory.objects.filter(user_id=obj.pk).count()
+        )
 
 
 
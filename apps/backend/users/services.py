@@ -1,6 +1,10 @@
 from django.contrib.auth import get_user_model
 from django.db import transaction
 
+from events import cache as event_cache
+
+from .serializers import UserSafeSerializer
+
 User = get_user_model()
 
 class UserService:
@@ -18,5 +22,13 @@ class UserService:
     def update_user_profile(user, data):
         for attr, value in data.items():
             setattr(user, attr, value)
-        user.save()
+        # A full save would write back a stale games_played_count.
+        user.save(update_fields=list(data))
+        UserService.invalidate_feed(data)
         return user
+
+    @staticmethod
+    def invalidate_feed(fields):
+        # Feed items embed their creator through UserSafeSerializer.
+        if set(fields) & set(UserSafeSerializer.Meta.fields):
+            transaction.on_commit(lambda: event_cache.invalidate(event_cache.FEED))
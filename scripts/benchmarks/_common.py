@@ -0,0 +1,232 @@
+"""
+Shared setup for the backend benchmarks: Django bootstrap, synthetic data
+in bulk SQL, timing and cleanup.
+
+Every benchmark row belongs to the `benchmark` user or to users named
+`benchmark-<n>`, and categories use the `benchmark-` slug prefix, so
+`--cleanup` removes exactly what was seeded. Run against a disposable
+database: seeding a million rows takes minutes and bloats the tables.
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Iterable
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "apps" / "backend"
+
+BENCHMARK_USERNAME = "benchmark"
+BENCHMARK_PREFIX = "benchmark-"
+# Rows inserted per statement while seeding.
+SEED_BATCH_SIZE = 100_000
+
+# Around Recife; the deterministic spread below covers ~110 x 110 km.
+CENTER_LAT = -8.05
+CENTER_LNG = -34.9
+SPREAD_DEGREES = 1.0
+CITIES = ("Recife", "Olinda", "Jaboatão dos Guararapes", "Paulista", "Camaragibe", "Cabo de Santo Agostinho")
+
+
+def setup_django() -> None:
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+
+
+def quote(name: str) -> str:
+    from django.db import connection
+
+    return connection.ops.quote_name(name)
+
+
+def id_base() -> int:
+    """
+    A fresh snowflake id; seeded rows use base + n. Ids advance 2**22 per
+    millisecond, so a few million offsets stay below anything the
+    application generates once seeding is under way.
+    """
+    from common.snowflake import SNOWFLAKE_GENERATOR
+
+    return SNOWFLAKE_GENERATOR.generate()
+
+
+def benchmark_user():
+    from django.contrib.auth import get_user_model
+
+    user, created = get_user_model().objects.get_or_create(username=BENCHMARK_USERNAME)
+    if created:
+        user.set_unusable_password()
+        user.save(update_fields=["password"])
+    return user
+
+
+def benchmark_categories(names: Iterable[str]) -> list[int]:
+    from django.utils.text import slugify
+    from events.models import EventCategory
+
+    return [
+        EventCategory.objects.get_or_create(
+            slug=f"{BENCHMARK_PREFIX}{slugify(name)}", defaults={"name": name}
+        )[0].pk
+        for name in names
+    ]
+
+
+def seed_events(
+    count: int,
+    category_ids: list[int],
+    title_words: Iterable[str] = ("Pelada", "Racha", "Treino", "Jogo"),
+    description_words: Iterable[str] = ("aberto", "amistoso", "iniciantes", "competitivo"),
+) -> tuple[int, int]:
+    """
+    Insert `count` events owned by the benchmark user and return their id
+    range [first, last]. Positions, dates and texts are derived from the
+    row number, so reruns produce the same dataset.
+    """
+    from django.db import connection, transaction
+    from events.models import Event
+
+    user = benchmark_user()
+    base = id_base()
+    table = quote(Event._meta.db_table)
+    point = (
+        "ST_SetSRID(ST_MakePoint("
+        "%(lng)s + ((g * 7919) %% 100003) / 100003.0 * %(spread)s, "
+        "%(lat)s + ((g * 104729) %% 100019) / 100019.0 * %(spread)s), 4326)"
+    )
+    sql = f"""
+        INSERT INTO {table} (
+            id, title, description, date, category_id, city, location, geohash,
+            created_by_id, slots, participants_count, created_at, updated_at
+        )
+        SELECT
+            %(base)s + g,
+            (%(titles)s::text[])[1 + g %% cardinality(%(titles)s::text[])]
+                || ' ' || (%(titles)s::text[])[1 + (g / 7) %% cardinality(%(titles)s::text[])]
+                || ' ' || g,
+            'Jogo ' || (%(descriptions)s::text[])[1 + g %% cardinality(%(descriptions)s::text[])],
+            now() + make_interval(hours => (g %% 4000) - 1000),
+            (%(categories)s::bigint[])[1 + g %% cardinality(%(categories)s::bigint[])],
+            (%(cities)s::text[])[1 + g %% cardinality(%(cities)s::text[])],
+            {point}::geography,
+            ST_GeoHash({point}, 12),
+            %(user)s,
+            10 + g %% 20,
+            0,
+            now() - make_interval(mins => g %% 100000),
+            now()
+        FROM generate_series(%(start)s, %(stop)s) AS g
+    """
+    params = {
+        "base": base,
+        "titles": list(title_words),
+        "descriptions": list(description_words),
+        "categories": category_ids,
+        "cities": list(CITIES),
+        "user": user.pk,
+        "lat": CENTER_LAT - SPREAD_DEGREES / 2,
+        "lng": CENTER_LNG - SPREAD_DEGREES / 2,
+        "spread": SPREAD_DEGREES,
+    }
+    for start in range(1, count + 1, SEED_BATCH_SIZE):
+        stop = min(start + SEED_BATCH_SIZE - 1, count)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, {**params, "start": start, "stop": stop})
+        print(f"  events {stop:,}/{count:,}", flush=True)
+    analyze(Event._meta.db_table)
+    return base + 1, base + count
+
+
+def seed_users(count: int) -> tuple[int, int]:
+    """Insert `count` users named benchmark-<n>; returns the id range."""
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+
+    base = id_base()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {quote(get_user_model()._meta.db_table)} (
+                id, password, is_superuser, username, first_name, last_name, email,
+                is_staff, is_active, date_joined, bio, avatar_url, favorite_sports,
+                games_played_count
+            )
+            SELECT %s + g, '!', false, %s || g, '', '', '', false, true, now(), '', '', '[]', 0
+            FROM generate_series(1, %s) AS g
+            """,
+            [base, BENCHMARK_PREFIX, count],
+        )
+    analyze(get_user_model()._meta.db_table)
+    return base + 1, base + count
+
+
+def analyze(table: str) -> None:
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {quote(table)}")
+
+
+def cleanup() -> None:
+    """Delete everything the benchmarks seeded, children first."""
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+    from events.models import Event, EventCategory, Participation, WaitlistEntry
+    from notifications.models import Notification
+    from rankings.models import EventScore, LeaderboardEntry, ParticipationChange, UserScore
+
+    users = quote(get_user_model()._meta.db_table)
+    events = quote(Event._meta.db_table)
+    benchmark_users = f"SELECT id FROM {users} WHERE username = %(user)s OR username LIKE %(prefix)s"
+    benchmark_events = f"SELECT id FROM {events} WHERE created_by_id IN ({benchmark_users})"
+    statements = [
+        f"DELETE FROM {quote(ParticipationChange._meta.db_table)} WHERE event_id IN ({benchmark_events})"
+        f" OR user_id IN ({benchmark_users})",
+        f"DELETE FROM {quote(EventScore._meta.db_table)} WHERE event_id IN ({benchmark_events})",
+        f"DELETE FROM {quote(UserScore._meta.db_table)} WHERE user_id IN ({benchmark_users})",
+        f"DELETE FROM {quote(LeaderboardEntry._meta.db_table)} WHERE user_id IN ({benchmark_users})",
+        f"DELETE FROM {quote(Notification._meta.db_table)} WHERE user_id IN ({benchmark_users})",
+        f"DELETE FROM {quote(WaitlistEntry._meta.db_table)} WHERE event_id IN ({benchmark_events})",
+        f"DELETE FROM {quote(Participation._meta.db_table)} WHERE event_id IN ({benchmark_events})"
+        f" OR user_id IN ({benchmark_users})",
+        f"DELETE FROM {events} WHERE created_by_id IN ({benchmark_users})",
+        f"DELETE FROM {quote(EventCategory._meta.db_table)} WHERE slug LIKE %(prefix)s",
+        f"DELETE FROM {users} WHERE username = %(user)s OR username LIKE %(prefix)s",
+    ]
+    params = {"user": BENCHMARK_USERNAME, "prefix": f"{BENCHMARK_PREFIX}%"}
+    with transaction.atomic(), connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement, params)
+    print("Benchmark data removed.")
+
+
+def measure(run: Callable[[], object], repeat: int) -> dict[str, float]:
+    """Run once to warm the cache, then `repeat` times; latencies in ms."""
+    run()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "p50": statistics.median(samples),
+        "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "max": samples[-1],
+    }
+
+
+def print_table(headers: list[str], rows: list[list[object]]) -> None:
+    cells = [headers] + [[f"{cell:.2f}" if isinstance(cell, float) else str(cell) for cell in row] for row in rows]
+    widths = [max(len(row[index]) for row in cells) for index in range(len(headers))]
+    for number, row in enumerate(cells):
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+        if number == 0:
+            print("  ".join("-" * width for width in widths))
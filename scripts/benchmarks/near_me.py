@@ -0,0 +1,94 @@
+"""
+Near-me feed latency over synthetic events.
+
+Seeds events spread over ~110 x 110 km around Recife and times the feed's
+distance queries, as EventViewSet builds them, at several radii: the KNN
+(<->) ordering with the ST_DWithin prefilter, against the previous
+ST_Distance <= r filter sorted by computed distance.
+
+    python scripts/benchmarks/near_me.py --seed --events 1000000
+    python scripts/benchmarks/near_me.py --radii 1 5 10 25 50
+    python scripts/benchmarks/near_me.py --cleanup
+
+Needs the backend requirements and a migrated PostGIS database reachable
+with the usual POSTGRES_* variables.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from _common import (
+    CENTER_LAT,
+    CENTER_LNG,
+    benchmark_categories,
+    cleanup,
+    measure,
+    print_table,
+    seed_events,
+    setup_django,
+)
+
+
+def legacy_queryset(lat: float, lng: float, radius_km: float | None, limit: int):
+    """The distance feed before KNN: distance_lte and ORDER BY ST_Distance."""
+    from django.contrib.gis.db.models.functions import Distance
+    from django.contrib.gis.measure import D
+    from events.models import Event
+    from events.services import LocationService
+
+    point = LocationService.build_point(lat, lng)
+    queryset = Event.objects.select_related("category", "created_by").annotate(
+        distance=Distance("location", point)
+    )
+    if radius_km is not None:
+        queryset = queryset.filter(location__distance_lte=(point, D(km=radius_km)))
+    return queryset.order_by("distance", "date")[:limit]
+
+
+def feed_queryset(lat: float, lng: float, radius_km: float | None, limit: int):
+    from events.management.commands.explain_feed_queries import feed_queryset as viewset_queryset
+
+    params = {"lat": str(lat), "lng": str(lng), "ordering": "distance"}
+    if radius_km is not None:
+        params["radius_km"] = str(radius_km)
+    return viewset_queryset(params, limit=limit)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="Insert the synthetic events first.")
+    parser.add_argument("--events", type=int, default=1_000_000, help="Events to seed (default 1,000,000).")
+    parser.add_argument("--radii", type=float, nargs="+", default=[1, 5, 10, 25, 50], help="Radii in km.")
+    parser.add_argument("--limit", type=int, default=10, help="Feed page size.")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query.")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the current queries.")
+    parser.add_argument("--cleanup", action="store_true", help="Delete the benchmark data and exit.")
+    args = parser.parse_args()
+
+    setup_django()
+    if args.cleanup:
+        cleanup()
+        return
+    if args.seed:
+        print(f"Seeding {args.events:,} events...")
+        seed_events(args.events, benchmark_categories(["Futebol", "Vôlei", "Basquete"]))
+
+    rows = []
+    for radius in [*args.radii, None]:
+        label = f"{radius:g} km" if radius is not None else "nearest"
+        current = measure(lambda: list(feed_queryset(CENTER_LAT, CENTER_LNG, radius, args.limit)), args.repeat)
+        row = [label, current["p50"], current["p95"]]
+        if not args.skip_legacy:
+            legacy = measure(lambda: list(legacy_queryset(CENTER_LAT, CENTER_LNG, radius, args.limit)), args.repeat)
+            row += [legacy["p50"], legacy["p95"], legacy["p50"] / current["p50"]]
+        rows.append(row)
+
+    headers = ["radius", "knn p50 ms", "knn p95 ms"]
+    if not args.skip_legacy:
+        headers += ["legacy p50 ms", "legacy p95 ms", "speedup"]
+    print_table(headers, rows)
+
+
+if __name__ == "__main__":
+    main()
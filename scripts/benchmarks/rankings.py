@@ -0,0 +1,220 @@
+"""
+Ranking refresh cost over a million synthetic participations.
+
+Seeds users, events and participations (with consistent counters), then
+times the full recomputation (rescore_all, rebuild_leaderboards) against
+the incremental refresh from the participation change log after a burst of
+new joins.
+
+    python scripts/benchmarks/rankings.py --seed --participations 1000000
+    python scripts/benchmarks/rankings.py --changes 10000
+    python scripts/benchmarks/rankings.py --cleanup
+
+Needs the backend requirements and a migrated PostGIS database reachable
+with the usual POSTGRES_* variables.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from _common import (
+    BENCHMARK_USERNAME,
+    analyze,
+    benchmark_categories,
+    cleanup,
+    id_base,
+    print_table,
+    quote,
+    seed_events,
+    seed_users,
+    setup_django,
+)
+
+# Events seeded per participation batch.
+EVENT_BATCH_SIZE = 5000
+
+
+def seed_participations(users: tuple[int, int], events: tuple[int, int], per_event: int) -> None:
+    """
+    Give every benchmark event `per_event` distinct participants, then bring
+    slots, participants_count and games_played_count in line.
+    """
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+    from events.models import Event, Participation
+
+    user_count = users[1] - users[0] + 1
+    event_count = events[1] - events[0] + 1
+    base = id_base()
+    participations = quote(Participation._meta.db_table)
+    for start in range(0, event_count, EVENT_BATCH_SIZE):
+        stop = min(start + EVENT_BATCH_SIZE, event_count) - 1
+        with transaction.atomic(), connection.cursor() as cursor:
+            # 104729 is prime, so the offsets within one event never repeat.
+            cursor.execute(
+                f"""
+                INSERT INTO {participations} (id, user_id, event_id, joined_at)
+                SELECT %(base)s + i * %(per_event)s + j,
+                       %(first_user)s + (i * 7919 + j * 104729) %% %(user_count)s,
+                       %(first_event)s + i,
+                       now() - make_interval(mins => (i * 31 + j * 17) %% 60000)
+                FROM generate_series(%(start)s, %(stop)s) AS i,
+                     generate_series(0, %(per_event)s - 1) AS j
+                """,
+                {
+                    "base": base,
+                    "per_event": per_event,
+                    "first_user": users[0],
+                    "user_count": user_count,
+                    "first_event": events[0],
+                    "start": start,
+                    "stop": stop,
+                },
+            )
+        print(f"  participations {(stop + 1) * per_event:,}/{event_count * per_event:,}", flush=True)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {quote(Event._meta.db_table)}
+            SET participants_count = %s, slots = GREATEST(slots, %s + 5)
+            WHERE id BETWEEN %s AND %s
+            """,
+            [per_event, per_event, events[0], events[1]],
+        )
+        cursor.execute(
+            f"""
+            UPDATE {quote(get_user_model()._meta.db_table)} u
+            SET games_played_count = c.games
+            FROM (
+                SELECT user_id, COUNT(*) AS games FROM {participations}
+                WHERE user_id BETWEEN %s AND %s GROUP BY user_id
+            ) c
+            WHERE u.id = c.user_id
+            """,
+            users,
+        )
+    analyze(Participation._meta.db_table)
+
+
+def add_joins(users: tuple[int, int], events: tuple[int, int], count: int) -> None:
+    """
+    New joins as EventService writes them: a participation, both counters
+    and a JOINED change row, backdated past the refresh's commit grace.
+    """
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+    from events.models import Event, Participation
+    from rankings.models import ParticipationChange
+    from rankings.services import COMMIT_GRACE
+
+    user_count = users[1] - users[0] + 1
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH joined AS (
+                INSERT INTO {quote(Participation._meta.db_table)} (id, user_id, event_id, joined_at)
+                SELECT %(base)s + g,
+                       %(first_user)s + (g * 15485863) %% %(user_count)s,
+                       %(first_event)s + g %% %(event_count)s,
+                       now()
+                FROM generate_series(0, %(count)s - 1) AS g
+                ON CONFLICT DO NOTHING
+                RETURNING user_id, event_id
+            ),
+            counted_events AS (
+                UPDATE {quote(Event._meta.db_table)} e
+                SET participants_count = e.participants_count + j.joins
+                FROM (SELECT event_id, COUNT(*) AS joins FROM joined GROUP BY event_id) j
+                WHERE e.id = j.event_id
+            ),
+            counted_users AS (
+                UPDATE {quote(get_user_model()._meta.db_table)} u
+                SET games_played_count = u.games_played_count + j.joins
+                FROM (SELECT user_id, COUNT(*) AS joins FROM joined GROUP BY user_id) j
+                WHERE u.id = j.user_id
+            )
+            INSERT INTO {quote(ParticipationChange._meta.db_table)} (event_id, user_id, delta, created_at)
+            SELECT event_id, user_id, %(delta)s, now() - %(grace)s FROM joined
+            """,
+            {
+                "base": id_base(),
+                "first_user": users[0],
+                "user_count": user_count,
+                "first_event": events[0],
+                "event_count": events[1] - events[0] + 1,
+                "count": count,
+                "delta": ParticipationChange.JOINED,
+                "grace": COMMIT_GRACE * 2,
+            },
+        )
+
+
+def benchmark_ranges() -> tuple[tuple[int, int], tuple[int, int]]:
+    from django.contrib.auth import get_user_model
+    from django.db.models import Count, Max, Min
+    from events.models import Event
+
+    # Ids are addressed by offset, so each range must come from one seed run.
+    ranges = []
+    for queryset in (
+        get_user_model().objects.filter(username__startswith="benchmark-"),
+        Event.objects.filter(created_by__username=BENCHMARK_USERNAME),
+    ):
+        bounds = queryset.aggregate(first=Min("id"), last=Max("id"), total=Count("id"))
+        if not bounds["total"]:
+            raise SystemExit("No benchmark data; run with --seed first.")
+        if bounds["last"] - bounds["first"] + 1 != bounds["total"]:
+            raise SystemExit("Benchmark data comes from several seed runs; run --cleanup and seed again.")
+        ranges.append((bounds["first"], bounds["last"]))
+    return ranges[0], ranges[1]
+
+
+def timed(label: str, run, rows: list[list[object]]) -> object:
+    started = time.perf_counter()
+    result = run()
+    rows.append([label, time.perf_counter() - started, result])
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="Insert the synthetic dataset first.")
+    parser.add_argument("--participations", type=int, default=1_000_000, help="Participations to seed.")
+    parser.add_argument("--users", type=int, default=100_000, help="Users to seed.")
+    parser.add_argument("--per-event", type=int, default=20, help="Participants per seeded event.")
+    parser.add_argument("--changes", type=int, default=10_000, help="New joins for the incremental run.")
+    parser.add_argument("--cleanup", action="store_true", help="Delete the benchmark data and exit.")
+    args = parser.parse_args()
+
+    setup_django()
+    from rankings.services import rebuild_leaderboards, refresh_leaderboards, refresh_scores, rescore_all
+
+    if args.cleanup:
+        cleanup()
+        return
+    if args.seed:
+        event_count = args.participations // args.per_event
+        print(f"Seeding {args.users:,} users, {event_count:,} events, {args.participations:,} participations...")
+        users = seed_users(args.users)
+        events = seed_events(event_count, benchmark_categories(["Futebol", "Vôlei", "Basquete"]))
+        seed_participations(users, events, args.per_event)
+    users, events = benchmark_ranges()
+
+    rows: list[list[object]] = []
+    # Drain changes left by earlier runs so the incremental step sees only its own.
+    refresh_scores()
+    refresh_leaderboards()
+    timed("full: rescore_all", rescore_all, rows)
+    timed("full: rebuild_leaderboards", rebuild_leaderboards, rows)
+
+    add_joins(users, events, args.changes)
+    timed(f"incremental: refresh_scores ({args.changes:,} joins)", refresh_scores, rows)
+    timed(f"incremental: refresh_leaderboards ({args.changes:,} joins)", refresh_leaderboards, rows)
+    print_table(["step", "seconds", "result"], rows)
+
+
+if __name__ == "__main__":
+    main()
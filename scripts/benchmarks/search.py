@@ -0,0 +1,100 @@
+"""
+Event search latency: weighted tsvector with trigram fallback against the
+previous SearchFilter ILIKE.
+
+Seeds events with Portuguese sports titles and descriptions, then times
+each term through EventViewSet's EventSearchFilter and through the old
+`ILIKE '%term%'` OR across title, description and category name. Terms
+include a missing accent and a misspelling, which only the new search
+matches.
+
+    python scripts/benchmarks/search.py --seed --events 1000000
+    python scripts/benchmarks/search.py --terms futebol volei futbol "pelada praia"
+    python scripts/benchmarks/search.py --cleanup
+
+Needs the backend requirements and a migrated PostGIS database reachable
+with the usual POSTGRES_* variables.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from _common import benchmark_categories, cleanup, measure, print_table, seed_events, setup_django
+
+CATEGORIES = ("Futebol", "Vôlei", "Basquete", "Futsal", "Beach Tênis", "Corrida")
+TITLE_WORDS = ("Pelada", "Racha", "Treino", "Torneio", "Amistoso", "Desafio", "Rachão", "Aulão")
+DESCRIPTION_WORDS = (
+    "na praia", "na quadra coberta", "society", "para iniciantes", "nível avançado",
+    "noturno", "de manhã", "valendo campeonato", "misto", "com arbitragem",
+)
+DEFAULT_TERMS = ("futebol", "volei", "futbol", "pelada praia", "rachão", "campeonato")
+
+
+def legacy_queryset(term: str, limit: int):
+    """SearchFilter over the former search_fields: every word ORs ILIKEs."""
+    from django.db.models import Q
+    from events.models import Event
+
+    queryset = Event.objects.select_related("category", "created_by")
+    for word in term.split():
+        queryset = queryset.filter(
+            Q(title__icontains=word) | Q(description__icontains=word) | Q(category__name__icontains=word)
+        )
+    return queryset.order_by("date")[:limit]
+
+
+def search_queryset(term: str, limit: int):
+    from events.management.commands.explain_feed_queries import feed_queryset
+
+    return feed_queryset({"search": term}, limit=limit)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="Insert the synthetic events first.")
+    parser.add_argument("--events", type=int, default=1_000_000, help="Events to seed (default 1,000,000).")
+    parser.add_argument("--terms", nargs="+", default=list(DEFAULT_TERMS), help="Search terms to time.")
+    parser.add_argument("--limit", type=int, default=10, help="Feed page size.")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per query.")
+    parser.add_argument("--cleanup", action="store_true", help="Delete the benchmark data and exit.")
+    args = parser.parse_args()
+
+    setup_django()
+    if args.cleanup:
+        cleanup()
+        return
+    if args.seed:
+        print(f"Seeding {args.events:,} events...")
+        seed_events(
+            args.events,
+            benchmark_categories(CATEGORIES),
+            title_words=TITLE_WORDS,
+            description_words=DESCRIPTION_WORDS,
+        )
+
+    rows = []
+    for term in args.terms:
+        current_hits = len(search_queryset(term, args.limit))
+        legacy_hits = len(legacy_queryset(term, args.limit))
+        current = measure(lambda: list(search_queryset(term, args.limit)), args.repeat)
+        legacy = measure(lambda: list(legacy_queryset(term, args.limit)), args.repeat)
+        rows.append([
+            term,
+            current["p50"],
+            current["p95"],
+            current_hits,
+            legacy["p50"],
+            legacy["p95"],
+            legacy_hits,
+            legacy["p50"] / current["p50"],
+        ])
+
+    print_table(
+        ["term", "fts p50 ms", "fts p95 ms", "fts rows", "ilike p50 ms", "ilike p95 ms", "ilike rows", "speedup"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()